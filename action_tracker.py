@@ -0,0 +1,325 @@
+import os
+import re
+import sys
+import zlib
+import array
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+ACTIONS_DB = Path(os.environ.get("RENA_ACTIONS_DB", Path("meeting_outputs") / "action_items.sqlite"))
+
+# MinHash: 64 permutations split into 16 LSH bands of 4 rows.
+# Items with Jaccard ~0.5+ collide in at least one band with high probability.
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MATCH_THRESHOLD = 0.6   # estimated Jaccard needed to merge with a historical item
+
+_PRIME = (1 << 61) - 1
+_MAX32 = (1 << 32) - 1
+# Fixed coefficients so signatures stay comparable across runs and machines
+_PERMS = [((i * 0x9E3779B1 + 0x7F4A7C15) % _PRIME | 1, (i * 0x85EBCA6B + 0xC2B2AE35) % _PRIME)
+          for i in range(1, NUM_PERM + 1)]
+
+STOPWORDS = {"the", "a", "an", "to", "of", "for", "and", "on", "in", "by", "with", "it", "this", "that",
+             "be", "is", "are", "will", "should", "need", "needs", "please", "all", "our", "their"}
+
+# Extend with your team: "ravi k" / "ravi kumar" -> "ravi kumar"
+OWNER_ALIASES: Dict[str, str] = {
+    "me": "speaker", "i": "speaker", "myself": "speaker",
+    "everyone": "team", "all": "team", "whole team": "team",
+    "": "unassigned", "tbd": "unassigned", "none": "unassigned", "n/a": "unassigned",
+}
+# Owners the LLM uses when it doesn't know who: they may merge with any named owner
+GENERIC_OWNERS = {"unassigned", "speaker"}
+# Whole names or real abbreviations only ("mon" must not match "month"/"monitor", "mar" not "market")
+WEEKDAYS = [re.compile(rf"\b(?:{p})\b") for p in (
+    "mon|monday", "tue|tues|tuesday", "wed|weds|wednesday", "thu|thur|thurs|thursday",
+    "fri|friday", "sat|saturday", "sun|sunday",
+)]
+MONTHS = [re.compile(rf"\b(?:{p})\b") for p in (
+    "jan|january", "feb|february", "mar|march", "apr|april", "may", "jun|june",
+    "jul|july", "aug|august", "sep|sept|september", "oct|october", "nov|november", "dec|december",
+)]
+
+
+# --- NORMALIZATION ---
+
+def normalize_task(task: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", (task or "").lower())
+    out = []
+    for w in words:
+        if w in STOPWORDS:
+            continue
+        for suffix in ("ing", "ed", "es", "s"):
+            if len(w) > len(suffix) + 2 and w.endswith(suffix):
+                w = w[: -len(suffix)]
+                break
+        out.append(w)
+    return out
+
+
+def normalize_owner(owner: str) -> str:
+    text = re.sub(r"\(.*?\)", "", (owner or "").lower())
+    text = re.split(r"[/,&]| and ", text)[0]
+    text = re.sub(r"\b(mr|mrs|ms|dr|sir|madam)\.?\s+", "", text)
+    text = " ".join(re.findall(r"[a-z0-9]+", text))
+    return OWNER_ALIASES.get(text, text) or "unassigned"
+
+
+def normalize_deadline(deadline: str, meeting_day: date) -> Optional[str]:
+    """Best-effort ISO date for a spoken deadline, relative to the meeting day."""
+    text = (deadline or "").lower().strip()
+    if not text or text in ("tbd", "n/a", "none", "ongoing"):
+        return None
+    if re.search(r"\b(today|eod|immediate|immediately|asap|now)\b", text):
+        return meeting_day.isoformat()
+    if "tomorrow" in text:
+        return (meeting_day + timedelta(days=1)).isoformat()
+    if re.search(r"\b(eow|end of (the )?week|this week)\b", text):
+        return (meeting_day + timedelta(days=(4 - meeting_day.weekday()) % 7)).isoformat()
+    if "next week" in text:
+        return (meeting_day + timedelta(days=7 - meeting_day.weekday())).isoformat()
+    if re.search(r"\b(eom|end of (the )?month|this month)\b", text):
+        return _month_end(meeting_day.year, meeting_day.month)
+    if re.search(r"\bnext month\b", text):
+        year, month = divmod(meeting_day.year * 12 + meeting_day.month, 12)  # month after, 0-based
+        return _month_end(year, month + 1)
+
+    m = re.search(r"(\d{4})-(\d{1,2})-(\d{1,2})", text)
+    if m:
+        return _safe_date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    # Day-first: 02/03 = 2 March. A dot only counts with a year (02.03.2026), so decimals
+    # ("3.5 weeks") and versions ("v1.2") are not dates; neither are numbers glued to letters.
+    m = (re.search(r"(?<![\w./])(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?(?![\w/]|\.\d)", text)
+         or re.search(r"(?<![\w./])(\d{1,2})\.(\d{1,2})\.(\d{2,4})(?![\w.]|\.\d)", text))
+    if m:
+        year = int(m.group(3)) if m.group(3) else meeting_day.year
+        return _safe_date(year + 2000 if year < 100 else year, int(m.group(2)), int(m.group(1)))
+
+    month = next((i + 1 for i, pattern in enumerate(MONTHS) if pattern.search(text)), None)
+    day_match = re.search(r"\b(\d{1,2})(?:st|nd|rd|th)?\b", text)
+    if month and day_match:
+        year_match = re.search(r"\b(20\d{2})\b", text)
+        year = int(year_match.group(1)) if year_match else meeting_day.year
+        iso = _safe_date(year, month, int(day_match.group(1)))
+        if iso and not year_match and iso < meeting_day.isoformat():
+            iso = _safe_date(year + 1, month, int(day_match.group(1)))
+        return iso
+
+    for i, pattern in enumerate(WEEKDAYS):
+        if pattern.search(text):
+            ahead = (i - meeting_day.weekday()) % 7 or 7
+            if "next" in text and ahead < 7:
+                ahead += 7
+            return (meeting_day + timedelta(days=ahead)).isoformat()
+    return None
+
+
+def _month_end(y: int, m: int) -> str:
+    first_of_next = date(y + m // 12, m % 12 + 1, 1)
+    return (first_of_next - timedelta(days=1)).isoformat()
+
+
+def _safe_date(y: int, m: int, d: int) -> Optional[str]:
+    try:
+        return date(y, m, d).isoformat()
+    except ValueError:
+        return None
+
+
+# --- MINHASH / LSH ---
+
+def shingles(tokens: List[str]) -> set:
+    grams = set(tokens)
+    grams.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return grams
+
+
+def minhash(grams: set) -> array.array:
+    sig = array.array("Q", [_MAX32] * NUM_PERM)
+    for g in grams:
+        h = zlib.crc32(g.encode("utf-8"))
+        for i, (a, b) in enumerate(_PERMS):
+            v = ((a * h + b) % _PRIME) & _MAX32
+            if v < sig[i]:
+                sig[i] = v
+    return sig
+
+
+def band_keys(sig: array.array) -> List[int]:
+    return [zlib.crc32(sig[b * ROWS:(b + 1) * ROWS].tobytes()) for b in range(BANDS)]
+
+
+def similarity(a: array.array, b: array.array) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+# --- STORE ---
+
+class ActionTracker:
+    """
+    Persistent cross-meeting action items. New items are merged into historical ones
+    through an LSH index (SQLite table keyed on band hashes), so a merge costs a few
+    indexed lookups instead of comparing against every stored item.
+    """
+
+    def __init__(self, db_path: Path = ACTIONS_DB, threshold: float = MATCH_THRESHOLD, wal: bool = True):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        if wal:  # WAL needs shared memory; keep the default journal for DBs on SMB/NFS shares
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task TEXT NOT NULL,
+                owner TEXT,
+                owner_norm TEXT NOT NULL,
+                deadline TEXT,
+                deadline_date TEXT,
+                status TEXT NOT NULL DEFAULT 'open',
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                occurrences INTEGER NOT NULL DEFAULT 1,
+                signature BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_items_owner ON items (status, owner_norm, deadline_date);
+            CREATE TABLE IF NOT EXISTS lsh (
+                band INTEGER NOT NULL, bucket INTEGER NOT NULL, item_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lsh ON lsh (band, bucket);
+            CREATE TABLE IF NOT EXISTS sightings (
+                item_id INTEGER NOT NULL, meeting TEXT NOT NULL, seen_at TEXT NOT NULL, task TEXT,
+                PRIMARY KEY (item_id, meeting)
+            );
+        """)
+        self._conn.commit()
+
+    def record_meeting(self, meeting: str, actions: List[Dict], when: Optional[datetime] = None) -> List[Dict]:
+        """
+        Merges a meeting's actions into the store. Returns one {id, new, occurrences, first_seen}
+        per action, or None for actions with no usable task words (they are not tracked).
+        """
+        when = when or datetime.now()
+        results = []
+        with self._lock:
+            for a in actions:
+                results.append(self._upsert(meeting, a, when))
+            self._conn.commit()
+        return results
+
+    def _upsert(self, meeting: str, action: Dict, when: datetime) -> Optional[Dict]:
+        task = (action.get("task") or "").strip()
+        tokens = normalize_task(task)
+        if not tokens:
+            # Empty/stopword-only tasks all share one all-max signature and would merge into one item
+            return None
+        owner = (action.get("owner") or "").strip()
+        deadline = (action.get("deadline") or "").strip()
+        owner_norm = normalize_owner(owner)
+        deadline_date = normalize_deadline(deadline, when.date())
+        sig = minhash(shingles(tokens))
+        keys = band_keys(sig)
+        stamp = when.isoformat(timespec="seconds")
+
+        match = self._best_match(sig, keys, owner_norm)
+        if match is not None:
+            item_id = match["id"]
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO sightings (item_id, meeting, seen_at, task) VALUES (?, ?, ?, ?)",
+                (item_id, meeting, stamp, task)
+            )
+            self._conn.execute(
+                "UPDATE items SET last_seen = ?, occurrences = occurrences + ?, "
+                "deadline = COALESCE(NULLIF(?, ''), deadline), deadline_date = COALESCE(?, deadline_date), "
+                "owner_norm = CASE WHEN owner_norm IN ('unassigned', 'speaker') AND ? NOT IN ('unassigned', 'speaker') "
+                "THEN ? ELSE owner_norm END WHERE id = ?",
+                (stamp, cur.rowcount, deadline, deadline_date, owner_norm, owner_norm, item_id)
+            )
+            row = self._conn.execute("SELECT occurrences, first_seen FROM items WHERE id = ?", (item_id,)).fetchone()
+            return {"id": item_id, "new": False, "occurrences": row["occurrences"], "first_seen": row["first_seen"]}
+
+        cur = self._conn.execute(
+            "INSERT INTO items (task, owner, owner_norm, deadline, deadline_date, first_seen, last_seen, signature) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (task, owner, owner_norm, deadline, deadline_date, stamp, stamp, sig.tobytes())
+        )
+        item_id = cur.lastrowid
+        self._conn.executemany("INSERT INTO lsh (band, bucket, item_id) VALUES (?, ?, ?)",
+                               [(b, k, item_id) for b, k in enumerate(keys)])
+        self._conn.execute("INSERT INTO sightings (item_id, meeting, seen_at, task) VALUES (?, ?, ?, ?)",
+                           (item_id, meeting, stamp, task))
+        return {"id": item_id, "new": True, "occurrences": 1, "first_seen": stamp}
+
+    def _best_match(self, sig, keys, owner_norm: str):
+        clause = " OR ".join(["(l.band = ? AND l.bucket = ?)"] * len(keys))
+        params = [v for pair in enumerate(keys) for v in pair]
+        candidates = self._conn.execute(
+            f"SELECT DISTINCT i.id, i.owner_norm, i.signature FROM lsh l JOIN items i ON i.id = l.item_id "
+            f"WHERE ({clause}) AND i.status = 'open'", params
+        ).fetchall()
+
+        best, best_score = None, self.threshold
+        for row in candidates:
+            if owner_norm != row["owner_norm"] and not GENERIC_OWNERS & {owner_norm, row["owner_norm"]}:
+                continue
+            other = array.array("Q")
+            other.frombytes(row["signature"])
+            score = similarity(sig, other)
+            if score >= best_score:
+                best, best_score = row, score
+        return best
+
+    # --- QUERIES ---
+
+    def open_items(self, owner: Optional[str] = None, limit: int = 200) -> List[Dict]:
+        sql = ("SELECT id, task, owner_norm AS owner, deadline, deadline_date, occurrences, first_seen, last_seen "
+               "FROM items WHERE status = 'open'")
+        params: list = []
+        if owner:
+            sql += " AND owner_norm = ?"
+            params.append(normalize_owner(owner))
+        sql += " ORDER BY deadline_date IS NULL, deadline_date, last_seen DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params)]
+
+    def open_counts_by_owner(self) -> List[Dict]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(
+                "SELECT owner_norm AS owner, COUNT(*) AS open_items, "
+                "SUM(deadline_date < date('now')) AS overdue FROM items WHERE status = 'open' "
+                "GROUP BY owner_norm ORDER BY open_items DESC")]
+
+    def set_status(self, item_id: int, status: str = "done") -> bool:
+        with self._lock:
+            cur = self._conn.execute("UPDATE items SET status = ? WHERE id = ?", (status, item_id))
+            self._conn.commit()
+            return cur.rowcount == 1
+
+
+# --- ENTRY POINT ---
+
+if __name__ == "__main__":
+    tracker = ActionTracker()
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "owners"
+    if cmd == "open":
+        owner = " ".join(sys.argv[2:]) or None
+        for it in tracker.open_items(owner):
+            print(f"#{it['id']:<5} [{it['owner']}] {it['task']}  (due {it['deadline_date'] or it['deadline'] or 'TBD'}, "
+                  f"seen {it['occurrences']}x since {it['first_seen'][:10]})")
+    elif cmd in ("close", "reopen") and len(sys.argv) > 2:
+        ok = tracker.set_status(int(sys.argv[2]), "done" if cmd == "close" else "open")
+        print("✅ Updated." if ok else "❌ No such item.")
+    elif cmd == "owners":
+        for row in tracker.open_counts_by_owner():
+            print(f"{row['owner']:<25} {row['open_items']:>5} open  {row['overdue'] or 0:>4} overdue")
+    else:
+        print("Usage: python action_tracker.py [owners | open [owner] | close <id> | reopen <id>]")
@@ -0,0 +1,245 @@
+import os
+import time
+import asyncio
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Union
+
+from loguru import logger
+
+from job_store import save_upload
+
+# Usage (inside any asyncio service):
+#
+#   pipeline = MeetingPipeline()
+#   async for event in pipeline.run("meeting.wav"):          # or run(websocket_bytes(), name="call.webm")
+#       if isinstance(event, SegmentTranscribed): ...
+#
+# One MeetingPipeline (one Whisper + LLM setup) serves any number of concurrent run() calls.
+
+
+# --- EVENTS ---
+
+@dataclass
+class SegmentTranscribed:
+    job_id: str
+    index: int
+    timestamp: str
+    start: float
+    end: float
+    text: str
+
+
+@dataclass
+class PartialAnalysis:
+    """A piece of the analysis as soon as it exists: summary_en, summary_<lang>, detected_context, mom."""
+    job_id: str
+    key: str
+    value: Any
+
+
+@dataclass
+class ActionItemFound:
+    job_id: str
+    task: str
+    owner: str
+    deadline: str
+    occurrences: int = 1           # >1: still open from earlier meetings (see action_tracker.py)
+    first_seen: Optional[str] = None
+    tracker_id: Optional[int] = None
+
+
+@dataclass
+class ArtifactWritten:
+    job_id: str
+    kind: str                      # "audio" (spooled stream) | "pdf"
+    path: str
+
+
+@dataclass
+class StageTiming:
+    job_id: str
+    stage: str
+    seconds: float
+    queued_s: float = 0.0          # time spent waiting for a transcription slot
+
+
+@dataclass
+class JobCompleted:
+    job_id: str
+    report_path: Optional[str]
+    intel: Dict = field(default_factory=dict)
+    segments: List[Dict] = field(default_factory=list)
+
+
+Event = Union[SegmentTranscribed, PartialAnalysis, ActionItemFound, ArtifactWritten, StageTiming, JobCompleted]
+
+_DONE = object()
+
+
+class _AsyncByteReader:
+    """Blocking .read(n) over an async byte iterator, so job_store.save_upload can consume it from a worker thread."""
+
+    def __init__(self, chunks: AsyncIterable[bytes], loop: asyncio.AbstractEventLoop):
+        self._it = chunks.__aiter__()
+        self._loop = loop
+
+    def read(self, n: int = -1) -> bytes:
+        while True:
+            try:
+                chunk = asyncio.run_coroutine_threadsafe(self._it.__anext__(), self._loop).result()
+            except StopAsyncIteration:
+                return b""
+            if chunk:
+                return bytes(chunk)
+
+
+# --- PIPELINE ---
+
+class MeetingPipeline:
+    """
+    asyncio front end for AdaptiveMeetingNotesGenerator.
+
+    Every blocking step (Whisper decode, compaction, LLM calls, action tracking, PDF) runs on
+    `executor`; the event loop only shuttles events. Whisper is CPU-bound and sized by its own
+    thread count, so at most `max_transcriptions` decodes run at once while other jobs analyze,
+    translate and render. Threads rather than processes: the models live in this process and
+    CTranslate2 / HTTP clients release the GIL.
+    """
+
+    def __init__(self, generator=None, executor: Optional[ThreadPoolExecutor] = None,
+                 max_transcriptions: int = 1, output_dir: Optional[Path] = None, **generator_kwargs):
+        self._generator = generator
+        self._generator_kwargs = generator_kwargs
+        self._generator_lock = asyncio.Lock()
+        self.executor = executor or ThreadPoolExecutor(max_workers=max(8, (os.cpu_count() or 4)),
+                                                       thread_name_prefix="rena-job")
+        self._transcribe_slots = asyncio.Semaphore(max_transcriptions)
+        self.output_dir = output_dir
+
+    async def generator(self):
+        """The shared generator, built off-loop on first use (Whisper load takes seconds)."""
+        async with self._generator_lock:
+            if self._generator is None:
+                from meeting_notes_generator import AdaptiveMeetingNotesGenerator
+                loop = asyncio.get_running_loop()
+                # Events replace the CLI banners/progress bars
+                kwargs = {"verbose": False, **self._generator_kwargs}
+                self._generator = await loop.run_in_executor(
+                    self.executor, lambda: AdaptiveMeetingNotesGenerator(**kwargs)
+                )
+        return self._generator
+
+    async def run(self, source: Union[str, os.PathLike, AsyncIterable[bytes]],
+                  name: str = "stream.wav") -> AsyncIterator[Event]:
+        """
+        Processes one recording and yields events as they happen; JobCompleted is always last.
+        `source` is a file path or an async iterable of audio bytes (`name` supplies its extension).
+        Errors are raised from the iterator. Closing the iterator early stops the job: transcription
+        at the next segment, otherwise at the next stage boundary (a stage already running on the
+        executor, e.g. an LLM call, finishes first, but nothing after it runs or is written).
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def emit(event):
+            # Safe from any thread
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        async def drive():
+            try:
+                await self._process(source, name, emit, cancelled)
+            finally:
+                emit(_DONE)
+
+        task = asyncio.create_task(drive())
+        try:
+            while True:
+                event = await queue.get()
+                if event is _DONE:
+                    break
+                yield event
+            await task  # re-raises a failed stage
+        finally:
+            cancelled.set()
+            if not task.done():
+                task.cancel()
+
+    async def _process(self, source, name: str, emit, cancelled: threading.Event):
+        loop = asyncio.get_running_loop()
+        gen = await self.generator()
+
+        # 0. Input
+        if isinstance(source, (str, os.PathLike)):
+            audio_path = Path(source)
+            if not audio_path.exists():
+                raise FileNotFoundError(audio_path)
+            job_id = audio_path.stem
+        else:
+            started = time.perf_counter()
+            job = await loop.run_in_executor(self.executor, save_upload, _AsyncByteReader(source, loop), name)
+            audio_path, job_id = job.audio_path, job.job_id
+            emit(ArtifactWritten(job_id, "audio", str(audio_path)))
+            emit(StageTiming(job_id, "upload", time.perf_counter() - started))
+
+        # 1. Transcribe (segments are streamed out as Whisper yields them)
+        waited = time.perf_counter()
+        async with self._transcribe_slots:
+            started = time.perf_counter()
+            segments = await loop.run_in_executor(
+                self.executor, self._transcribe, gen, str(audio_path), job_id, emit, cancelled
+            )
+        emit(StageTiming(job_id, "transcribe", time.perf_counter() - started, queued_s=started - waited))
+
+        # 2. Compact + analyze (summary and translations surface before MOM/actions finish)
+        prompt_text = await self._stage(job_id, "compact", emit, cancelled, gen.compact, segments)
+        intel = await self._stage(job_id, "analyze", emit, cancelled, gen.analyze_transcript, prompt_text,
+                                  lambda key, value: emit(PartialAnalysis(job_id, key, value)))
+        for key in ("detected_context", "mom"):
+            if key in intel:
+                emit(PartialAnalysis(job_id, key, intel[key]))
+
+        # 3. Actions (merged with the cross-meeting tracker first, so recurrence is known)
+        filename = audio_path.stem + "_report"
+        await self._stage(job_id, "track_actions", emit, cancelled, gen.track_actions, intel, filename)
+        for a in intel.get("actions", []):
+            if isinstance(a, dict):
+                emit(ActionItemFound(job_id, a.get("task", ""), a.get("owner", "Unassigned"),
+                                     a.get("deadline", "TBD"), a.get("occurrences", 1),
+                                     a.get("first_seen"), a.get("tracker_id")))
+
+        # 4. PDF
+        pdf = await self._stage(job_id, "pdf", emit, cancelled, gen.generate_pdf, intel, segments, filename,
+                                self.output_dir)
+        if pdf:
+            emit(ArtifactWritten(job_id, "pdf", pdf))
+        emit(JobCompleted(job_id, pdf, intel, segments))
+
+    async def _stage(self, job_id: str, stage: str, emit, cancelled: threading.Event, fn, *args):
+        if cancelled.is_set():
+            # The consumer is gone: spend no more LLM quota, touch neither the tracker nor the PDF
+            logger.info(f"   [Async] {job_id}: consumer went away, skipping '{stage}' and later stages.")
+            raise asyncio.CancelledError()
+        started = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        emit(StageTiming(job_id, stage, time.perf_counter() - started))
+        return result
+
+    @staticmethod
+    def _transcribe(gen, audio_path: str, job_id: str, emit, cancelled: threading.Event) -> List[Dict]:
+        segments = []
+        for seg in gen.iter_segments(audio_path):
+            if cancelled.is_set():
+                logger.info(f"   [Async] {job_id}: consumer went away, stopping transcription.")
+                break
+            emit(SegmentTranscribed(job_id, len(segments), seg["timestamp"], seg["start"], seg["end"], seg["text"]))
+            segments.append(seg)
+        if not segments:
+            logger.warning(f"   ⚠️ {job_id}: NO SPEECH DETECTED.")
+        return segments
+
+    def close(self):
+        self.executor.shutdown(wait=False)
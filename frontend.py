@@ -5,6 +5,8 @@ import time
 import sys
 from pathlib import Path
 
+from job_store import save_upload, cleanup_incoming
+
 # --- 1. PAGE CONFIGURATION & STYLING ---
 st.set_page_config(
     page_title="RENA | AI Meeting Agent",
@@ -172,15 +174,23 @@ with st.expander("🛠️ Manual Tools & Uploads"):
              subprocess.Popen([sys.executable, "rena_bot_pilot.py", "--auto"])
     
     with ac2:
-         uploaded_file = st.file_uploader("📂 Upload Recording", type=["wav", "mp3"], label_visibility="collapsed")
+         uploaded_file = st.file_uploader("📂 Upload Recording", type=["wav", "mp3", "m4a"], label_visibility="collapsed")
     
     with ac3:
          if uploaded_file and st.button("Analyze File", use_container_width=True):
-            save_path = Path("temp_audio.wav")
-            with open(save_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            st.info("🧠 RENA is processing the file...")
-            subprocess.Popen([sys.executable, "meeting_notes_generator.py", str(save_path)])
+            # Stream to a per-job folder (hashed while writing) so parallel uploads never collide
+            cleanup_incoming()
+            uploaded_file.seek(0)
+            job = save_upload(uploaded_file, uploaded_file.name)
+            status = job.status()
+            if status == "done":
+                st.success(f"♻️ Already analyzed — see **{job.report_path.name}** below.")
+            elif status == "processing":
+                st.info("🧠 RENA is already processing this recording...")
+            else:
+                proc = subprocess.Popen([sys.executable, "meeting_notes_generator.py", str(job.audio_path)])
+                job.mark_started(pid=proc.pid)
+                st.info("🧠 RENA is processing the file...")
 
 # --- 5. INTELLIGENCE FEED ---
 st.markdown("---")
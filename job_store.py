@@ -0,0 +1,140 @@
+import os
+import re
+import json
+import time
+import uuid
+import hashlib
+from pathlib import Path
+
+OUTPUT_DIR = Path("meeting_outputs")
+JOBS_DIR = OUTPUT_DIR / "jobs"
+INCOMING_DIR = JOBS_DIR / "_incoming"
+
+CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB per read/write
+JOB_STALE_AFTER = 6 * 3600    # a "processing" job with no report after this is considered dead
+
+
+def _safe_stem(name: str) -> str:
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "_", Path(name).stem).strip("_")
+    return stem[:60] or "recording"
+
+
+class Job:
+    """One uploaded recording, stored once per content hash under meeting_outputs/jobs/<job_id>/."""
+
+    def __init__(self, job_dir: Path, audio_path: Path, is_duplicate: bool = False):
+        self.job_dir = Path(job_dir)
+        self.job_id = self.job_dir.name
+        self.audio_path = Path(audio_path)
+        self.is_duplicate = is_duplicate
+
+    @property
+    def report_path(self) -> Path:
+        # Same naming rule as AdaptiveMeetingNotesGenerator.process
+        return OUTPUT_DIR / f"{self.audio_path.stem}_report.pdf"
+
+    @property
+    def meta_path(self) -> Path:
+        return self.job_dir / "job.json"
+
+    def meta(self) -> dict:
+        try:
+            return json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def status(self) -> str:
+        """'done' | 'processing' | 'new' (never started, or the previous run died/finished without a report)."""
+        if self.report_path.exists():
+            return "done"
+        meta = self.meta()
+        started = meta.get("started_at")
+        if not started or time.time() - started >= JOB_STALE_AFTER:
+            return "new"
+        if meta.get("pid") and not _pid_alive(meta["pid"]):
+            return "new"
+        return "processing"
+
+    def mark_started(self, pid: int = None):
+        """`pid` is the generator process; once it is gone without a report the job can be rerun."""
+        meta = self.meta()
+        meta.update({"started_at": time.time(), "audio": self.audio_path.name, "pid": pid})
+        self.meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill() would terminate the process on Windows; ask for its exit code instead
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        ok = kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return bool(ok) and code.value == 259  # STILL_ACTIVE
+    try:
+        # Our own child: reap it if it exited, otherwise it lingers as a zombie and looks alive
+        reaped, _ = os.waitpid(pid, os.WNOHANG)
+        return reaped == 0
+    except ChildProcessError:
+        pass  # started by an earlier server process
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def save_upload(stream, filename: str, chunk_size: int = CHUNK_SIZE) -> Job:
+    """
+    Streams `stream` (anything with .read(n)) to disk in chunks, hashing as it writes.
+    Identical content maps to the same job, so a re-upload reuses the existing job.
+    """
+    INCOMING_DIR.mkdir(parents=True, exist_ok=True)
+    part = INCOMING_DIR / f"{uuid.uuid4().hex}.part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part, "wb") as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+
+        job_id = digest.hexdigest()[:16]
+        job_dir = JOBS_DIR / job_id
+        try:
+            job_dir.mkdir(parents=True)
+        except FileExistsError:
+            existing = next((p for p in job_dir.iterdir() if p.name != "job.json"), None)
+            if existing is not None:
+                return Job(job_dir, existing, is_duplicate=True)
+
+        suffix = Path(filename).suffix.lower() or ".wav"
+        audio_path = job_dir / f"{_safe_stem(filename)}_{job_id[:8]}{suffix}"
+        os.replace(part, audio_path)
+        (job_dir / "job.json").write_text(json.dumps({
+            "job_id": job_id, "source_name": filename, "bytes": size, "sha256": digest.hexdigest(),
+            "created_at": time.time()
+        }, indent=2), encoding="utf-8")
+        return Job(job_dir, audio_path)
+    finally:
+        if part.exists():
+            part.unlink()
+
+
+def cleanup_incoming(max_age: float = 24 * 3600):
+    """Removes half-written uploads left behind by crashed sessions."""
+    if not INCOMING_DIR.exists():
+        return
+    for p in INCOMING_DIR.glob("*.part"):
+        if time.time() - p.stat().st_mtime > max_age:
+            try: p.unlink()
+            except OSError: pass
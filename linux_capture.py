@@ -0,0 +1,87 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+# Chromium flags for server-side meetings: no window, no GPU, and keep audio
+# flowing while the (invisible) page is "in the background".
+# "--headless=new" is the full browser in headless mode; unlike the headless shell it still plays audio.
+HEADLESS_ARGS = [
+    "--headless=new",
+    "--disable-gpu",
+    "--autoplay-policy=no-user-gesture-required",
+    "--disable-background-media-suspend",
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+]
+
+# Tiny viewport: Meet requests the lowest simulcast layer for tiles this small.
+HEADLESS_VIEWPORT = {"width": 320, "height": 240}
+
+# We only want audio: disable every remote video track as it is attached and never paint <video>.
+VIDEO_OFF_SCRIPT = """
+(() => {
+  const desc = Object.getOwnPropertyDescriptor(HTMLMediaElement.prototype, 'srcObject');
+  Object.defineProperty(HTMLMediaElement.prototype, 'srcObject', {
+    configurable: true,
+    get() { return desc.get.call(this); },
+    set(stream) {
+      if (stream && stream.getVideoTracks) stream.getVideoTracks().forEach(t => { t.enabled = false; });
+      desc.set.call(this, stream);
+    }
+  });
+  const style = document.createElement('style');
+  style.textContent = 'video { display: none !important; }';
+  document.addEventListener('DOMContentLoaded', () => document.head.appendChild(style));
+})();
+"""
+
+
+class PulseNullSink:
+    """
+    A dedicated PulseAudio/PipeWire (pipewire-pulse) null sink for one meeting.
+    Chromium plays into it via PULSE_SINK; ffmpeg records its .monitor source.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.module_id = None
+
+    @property
+    def monitor(self) -> str:
+        return f"{self.name}.monitor"
+
+    def create(self):
+        out = subprocess.run(
+            ["pactl", "load-module", "module-null-sink", f"sink_name={self.name}",
+             f"sink_properties=device.description={self.name}"],
+            capture_output=True, text=True, check=True
+        )
+        self.module_id = out.stdout.strip()
+        return self
+
+    def remove(self):
+        if self.module_id:
+            subprocess.run(["pactl", "unload-module", self.module_id], capture_output=True)
+            self.module_id = None
+
+    def browser_env(self) -> dict:
+        return {**os.environ, "PULSE_SINK": self.name}
+
+
+def ffmpeg_pulse_command(ffmpeg_exe: str, sink: PulseNullSink, out_path: Path) -> list:
+    # 16 kHz mono is what Whisper consumes anyway: smaller files, less encode CPU
+    return [ffmpeg_exe, "-y", "-f", "pulse", "-i", sink.monitor, "-ac", "1", "-ar", "16000", str(out_path)]
+
+
+def clone_profile(user_data_dir: str) -> str:
+    """Chromium locks its profile, so each concurrent meeting gets a throwaway copy of the login session."""
+    target = tempfile.mkdtemp(prefix="rena_profile_")
+    if os.path.isdir(user_data_dir):
+        shutil.copytree(user_data_dir, target, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns("Singleton*", "*.lock", "Cache", "Code Cache", "GPUCache"))
+    return target
@@ -0,0 +1,167 @@
+import os
+import time
+import threading
+from typing import Dict, Iterator, List, Optional, Union
+
+from loguru import logger
+
+try:
+    import ollama
+    OLLAMA_AVAILABLE = True
+except ImportError:
+    OLLAMA_AVAILABLE = False
+
+# Point at a stand-in server for tests: OLLAMA_HOST=http://127.0.0.1:18080
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+
+NS = 1e9  # Ollama reports durations in nanoseconds
+# Starting estimate and calibration ceiling. prompt_eval_count skips KV-cache-reused prefix tokens
+# and is capped on truncated prompts, and both inflate chars/token, so samples may only lower it.
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+
+def _field(obj, name, default=0):
+    """Works for both dict responses (old client) and pydantic responses (new client)."""
+    try:
+        value = obj.get(name, default)
+    except AttributeError:
+        value = getattr(obj, name, default)
+    return default if value is None else value
+
+
+class LocalLLMManager:
+    """
+    Owns one local Ollama model:
+    - a persistent HTTP client (connection reused across calls),
+    - warm-up + pinning via keep_alive so the first fallback doesn't pay the load,
+    - num_ctx sized from the measured prompt token count (never silently truncated),
+    - load time reported separately from prompt/generation time.
+    """
+
+    def __init__(self, model: str, host: Optional[str] = None, keep_alive: Union[int, str] = -1,
+                 min_ctx: int = 4096, max_ctx: int = 32768, reserve_tokens: int = 2048,
+                 timeout: float = 900, client=None):
+        if not OLLAMA_AVAILABLE:
+            raise RuntimeError("ollama package is not installed")
+        self.model = model
+        self.host = host or OLLAMA_HOST
+        self.keep_alive = keep_alive
+        self.min_ctx = min_ctx
+        self.max_ctx = max_ctx
+        self.reserve_tokens = reserve_tokens
+        # Pass `client` to share one connection pool between several models on the same server
+        self.client = client or ollama.Client(host=self.host, timeout=timeout)
+
+        # Calibrated from Ollama's prompt_eval_count after every call (never above the default)
+        self.chars_per_token = DEFAULT_CHARS_PER_TOKEN
+        # Only ever grows: a different num_ctx forces Ollama to reload the model
+        self.num_ctx = min_ctx
+        self.last_stats: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._warm = threading.Event()
+        self._warm_thread = None
+
+    # --- AVAILABILITY / WARM-UP ---
+
+    def is_available(self) -> bool:
+        try:
+            self.client.list()
+            return True
+        except Exception:
+            return False
+
+    def warm_up(self, expected_prompt_chars: int = 0, background: bool = True):
+        """Loads and pins the model. Empty prompt = load only, no generation."""
+        if expected_prompt_chars:
+            self.num_ctx = self.context_for(self.tokens_for_chars(expected_prompt_chars))
+        if background:
+            self._warm_thread = threading.Thread(target=self._warm_up, daemon=True, name=f"warm-{self.model}")
+            self._warm_thread.start()
+            return self._warm_thread
+        self._warm_up()
+
+    def _warm_up(self):
+        start = time.perf_counter()
+        try:
+            response = self.client.generate(
+                model=self.model, prompt="", keep_alive=self.keep_alive,
+                options={"num_ctx": self.num_ctx}
+            )
+            load = _field(response, "load_duration") / NS
+            logger.info(f"   [Local] {self.model} warm (load {load:.1f}s, wall {time.perf_counter() - start:.1f}s, "
+                        f"num_ctx {self.num_ctx}, keep_alive {self.keep_alive}).")
+            self._warm.set()
+        except Exception as e:
+            logger.warning(f"   ⚠️ Warm-up of {self.model} failed: {e}")
+
+    @property
+    def is_warm(self) -> bool:
+        return self._warm.is_set()
+
+    # --- CONTEXT SIZING ---
+
+    def tokens_for_chars(self, chars: int) -> int:
+        return int(chars / self.chars_per_token) + 1
+
+    def count_tokens(self, text: str) -> int:
+        return self.tokens_for_chars(len(text))
+
+    def context_for(self, prompt_tokens: int, num_predict: Optional[int] = None) -> int:
+        needed = prompt_tokens + (num_predict or self.reserve_tokens)
+        ctx = self.min_ctx
+        while ctx < needed and ctx < self.max_ctx:
+            ctx *= 2
+        if needed > self.max_ctx:
+            logger.warning(f"   ⚠️ Prompt needs ~{needed} tokens, capped at num_ctx={self.max_ctx}.")
+        return max(self.num_ctx, min(ctx, self.max_ctx))
+
+    # --- CHAT ---
+
+    def chat(self, messages: List[Dict], stream: bool = False, format: Optional[str] = None,
+             num_predict: Optional[int] = None):
+        """Same shape as ollama.chat; returns a response or a chunk iterator when stream=True."""
+        prompt_chars = sum(len(m.get("content", "")) for m in messages)
+        prompt_tokens = self.tokens_for_chars(prompt_chars)
+        with self._lock:
+            self.num_ctx = self.context_for(prompt_tokens, num_predict)
+        options = {"num_ctx": self.num_ctx}
+        if num_predict:
+            options["num_predict"] = num_predict
+
+        kwargs = {"format": format} if format else {}
+
+        start = time.perf_counter()
+        response = self.client.chat(
+            model=self.model, messages=messages, stream=stream,
+            options=options, keep_alive=self.keep_alive, **kwargs
+        )
+        if not stream:
+            self._record(response, prompt_chars, start)
+            return response
+        return self._stream(response, prompt_chars, start)
+
+    def _stream(self, chunks, prompt_chars: int, start: float) -> Iterator:
+        for chunk in chunks:
+            if _field(chunk, "done", False):
+                self._record(chunk, prompt_chars, start)
+            yield chunk
+
+    def _record(self, final, prompt_chars: int, start: float):
+        prompt_count = _field(final, "prompt_eval_count")
+        stats = {
+            "load_s": _field(final, "load_duration") / NS,
+            "prompt_s": _field(final, "prompt_eval_duration") / NS,
+            "generate_s": _field(final, "eval_duration") / NS,
+            "wall_s": time.perf_counter() - start,
+            "prompt_tokens": prompt_count,
+            "output_tokens": _field(final, "eval_count"),
+            "num_ctx": self.num_ctx,
+        }
+        # A count at num_ctx means the prompt was truncated: the ratio is meaningless
+        if prompt_count and prompt_count < self.num_ctx:
+            self.chars_per_token = min(DEFAULT_CHARS_PER_TOKEN, max(1.0, prompt_chars / prompt_count))
+        self.last_stats = stats
+        self._warm.set()
+        logger.info(f"   [Local] load {stats['load_s']:.1f}s | prompt {stats['prompt_s']:.1f}s "
+                    f"({stats['prompt_tokens']} tok) | generate {stats['generate_s']:.1f}s "
+                    f"({stats['output_tokens']} tok) | num_ctx {self.num_ctx}")
@@ -4,9 +4,10 @@ import warnings
 import sys
 import time
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional
 
 # --- AI LIBRARIES ---
 from faster_whisper import WhisperModel
@@ -21,11 +22,8 @@ except ImportError:
     GOOGLE_AVAILABLE = False
 
 # 2. Ollama (Fallback - Local)
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+from local_llm import LocalLLMManager, OLLAMA_AVAILABLE
+from rate_limiter import QuotaLimiter, CloudRequestScheduler, PreferLocal
 
 # --- REPORTLAB (PDF) IMPORTS ---
 from reportlab.lib import colors
@@ -35,18 +33,50 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
+from translation_stage import TranslationMemory, SummaryTranslator, SummaryWatcher
+from transcript_compactor import CompactionConfig, compact_transcript
+from profiling import StageProfiler, apply_cli_flags
+from action_tracker import ActionTracker
+
 warnings.filterwarnings("ignore")
 
 # ==========================================
 # 🔑 CONFIGURATION
 # ==========================================
 GEMINI_API_KEY = "YOUR_OWN_GOOGLE_API_KEY"
+GEMINI_MODEL = "gemini-1.5-flash-latest"
+# Shared across every bot/generator process on this machine (see rate_limiter.py)
+GEMINI_RPM = 15
+GEMINI_TPM = 1_000_000
 
 # RECOMMENDATION: Use "qwen2.5:32b" for best intelligence.
 OLLAMA_MODEL = "qwen2.5:32b" 
+# -1 pins the fallback model in memory so the first fallback never pays the load.
+OLLAMA_KEEP_ALIVE = -1
+OLLAMA_MAX_CTX = 32768
+
+# Translation is its own stage on a smaller local model (runs alongside MOM/actions).
+TRANSLATION_MODEL = "qwen2.5:7b"
+SUMMARY_LANGUAGES = ["hi"]
+
+# Languages the PDF can render -> (Display name, font file in FONTS_DIR or None for Helvetica)
+PDF_LANGUAGES = {
+    "hi": ("Hindi", "NotoSansDevanagari-Regular.ttf"),
+    "mr": ("Marathi", "NotoSansDevanagari-Regular.ttf"),
+    "ne": ("Nepali", "NotoSansDevanagari-Regular.ttf"),
+    "bn": ("Bengali", "NotoSansBengali-Regular.ttf"),
+    "ta": ("Tamil", "NotoSansTamil-Regular.ttf"),
+    "es": ("Spanish", None),
+    "fr": ("French", None),
+    "de": ("German", None),
+}
+
+# Prompt-side transcript compaction (PDF always keeps the full transcript). enabled=False sends it verbatim.
+COMPACTION = CompactionConfig()
 
 OUTPUT_DIR = Path("meeting_outputs")
 OUTPUT_DIR.mkdir(exist_ok=True)
+QUOTA_DB = Path(os.environ.get("RENA_QUOTA_DB", OUTPUT_DIR / "gemini_quota.sqlite"))
 FONTS_DIR = Path(r"C:\Users\admin\Desktop\RENA-Meet\fonts") 
 
 # --- CONFIGURE LOGGER ---
@@ -54,40 +84,88 @@ logger.remove()
 logger.add(sys.stderr, format="<green>{time:HH:mm:ss}</green> | <level>{message}</level>")
 
 def setup_fonts():
-    """Loads Hindi font for PDF support"""
-    font_path = FONTS_DIR / "NotoSansDevanagari-Regular.ttf"
-    if font_path.exists():
+    """Registers every language font found in FONTS_DIR. Returns {lang: font_name}."""
+    fonts = {}
+    for lang, (_, font_file) in PDF_LANGUAGES.items():
+        if font_file is None:
+            fonts[lang] = 'Helvetica'
+            continue
+        font_path = FONTS_DIR / font_file
+        if not font_path.exists():
+            continue
+        font_name = Path(font_file).stem
         try:
-            pdfmetrics.registerFont(TTFont('HindiFont', str(font_path)))
-            return True
-        except: return False
-    return False
+            if font_name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(font_name, str(font_path)))
+            fonts[lang] = font_name
+        except: pass
+    return fonts
 
-HINDI_AVAILABLE = setup_fonts()
+LANGUAGE_FONTS = setup_fonts()
 
 class AdaptiveMeetingNotesGenerator:
-    def __init__(self, whisper_model="medium"):
-        print("\n" + "="*60)
+    def __init__(self, whisper_model="medium", languages=None, compaction: CompactionConfig = None,
+                 action_tracker: ActionTracker = None, llm: bool = True, verbose: bool = True):
+        # llm=False -> transcription-only instance (no Gemini/Ollama/translation set up, nothing
+        # warmed or pinned); the counterpart of whisper_model=None. Only transcribe() is usable.
+        # verbose=False: no banners/progress bars on stdout (embedding, see async_api.py); logging is unaffected
+        self.verbose = verbose
+        self._print("\n" + "="*60)
         logger.info(f"🔧 SYSTEM INIT | Model: {OLLAMA_MODEL}")
-        print("="*60)
+        self._print("="*60)
 
         # 1. SETUP GOOGLE
         self.google_client = None
-        if GOOGLE_AVAILABLE:
+        if llm and GOOGLE_AVAILABLE:
             try:
                 self.google_client = genai.Client(api_key=GEMINI_API_KEY)
                 logger.info("   [Primary] Google Gemini Client Initialized.")
             except: pass
 
-        # 2. SETUP OLLAMA
-        if OLLAMA_AVAILABLE:
-            try:
-                ollama.list()
-                logger.info(f"   [Fallback] Local Ollama Ready ({OLLAMA_MODEL}).")
-            except:
+        self.cloud_scheduler = None
+        if llm:
+            self.cloud_scheduler = CloudRequestScheduler(QuotaLimiter(QUOTA_DB, "gemini", GEMINI_RPM, GEMINI_TPM))
+
+        # 2. SETUP OLLAMA (warm-up runs in the background while Whisper loads)
+        self.local_llm = None
+        self.translation_llm = None
+        if llm and OLLAMA_AVAILABLE:
+            manager = LocalLLMManager(OLLAMA_MODEL, keep_alive=OLLAMA_KEEP_ALIVE, max_ctx=OLLAMA_MAX_CTX)
+            if manager.is_available():
+                self.local_llm = manager
+                self.local_llm.warm_up(expected_prompt_chars=50000)
+                self.translation_llm = LocalLLMManager(TRANSLATION_MODEL, keep_alive="30m", client=manager.client)
+                self.translation_llm.warm_up()
+                logger.info(f"   [Fallback] Local Ollama Ready ({OLLAMA_MODEL}), warming up...")
+            else:
                 logger.warning("⚠️ Ollama not reachable. Run 'ollama serve' in terminal.")
 
-        # 3. SETUP WHISPER
+        self.compaction = compaction or COMPACTION
+        # Fleet workers pass one tracker on the shared store so history isn't split per node
+        self.action_tracker = action_tracker or (ActionTracker() if llm else None)
+
+        # 3. SETUP TRANSLATION STAGE
+        self.languages = [l for l in (languages or SUMMARY_LANGUAGES) if l in PDF_LANGUAGES]
+        for lang in self.languages:
+            if lang not in LANGUAGE_FONTS:
+                logger.warning(f"⚠️ No font for '{lang}' in {FONTS_DIR}; PDF text may not render.")
+        self.translator = None
+        if llm:
+            self.translator = SummaryTranslator(
+                self.translation_llm,
+                TranslationMemory(OUTPUT_DIR / "translation_memory.sqlite"),
+                cloud_client=self.google_client,
+                cloud_model=GEMINI_MODEL,
+                cloud_scheduler=self.cloud_scheduler
+            )
+            logger.info(f"   [Translate] {', '.join(self.languages) or 'off'} via {TRANSLATION_MODEL}.")
+        else:
+            logger.info("   [Mode] Transcription only: LLM and translation setup skipped.")
+
+        # 4. SETUP WHISPER (whisper_model=None -> analysis-only instance, e.g. fleet analyze workers)
+        self.whisper = None
+        if whisper_model is None:
+            return
         logger.info(f"   [Audio] Loading Whisper ({whisper_model})...")
         try:
             self.whisper = WhisperModel(whisper_model, device="cpu", compute_type="int8")
@@ -96,42 +174,33 @@ class AdaptiveMeetingNotesGenerator:
             logger.error(f"❌ Whisper Failed: {e}")
             sys.exit(1)
 
+    def _print(self, *args, **kwargs):
+        if self.verbose:
+            print(*args, **kwargs)
+
     # --- STEP 1: TRANSCRIPTION ---
     def transcribe(self, audio_path: str) -> Dict:
-        print("\n" + "-"*60)
+        self._print("\n" + "-"*60)
         logger.info("🎙️ STEP 1: TRANSCRIPTION")
-        print("-"*60)
+        self._print("-"*60)
         
         if not os.path.exists(audio_path):
             logger.error("Audio file does not exist.")
             return {"transcript": "", "segments": []}
 
-        # Relaxed VAD parameters
-        segments, _ = self.whisper.transcribe(
-            audio_path,
-            beam_size=5,
-            vad_filter=True,
-            vad_parameters=dict(min_silence_duration_ms=500) 
-        )
-
         full_text = []
         transcript_segments = []
         
-        print("   Processing Timeline: ", end="")
+        self._print("   Processing Timeline: ", end="")
         has_speech = False
         
-        for segment in segments:
+        for seg in self.iter_segments(audio_path):
             has_speech = True
-            text = segment.text.strip()
-            
-            m, s = divmod(int(segment.start), 60)
-            timestamp = f"{m:02d}:{s:02d}"
-            
-            transcript_segments.append({"timestamp": timestamp, "text": text})
-            full_text.append(f"[{timestamp}] {text}")
-            print("▓", end="", flush=True)
+            transcript_segments.append(seg)
+            full_text.append(f"[{seg['timestamp']}] {seg['text']}")
+            self._print("▓", end="", flush=True)
             
-        print(" [Done]")
+        self._print(" [Done]")
         
         if not has_speech:
             logger.warning("⚠️  NO SPEECH DETECTED.")
@@ -142,16 +211,50 @@ class AdaptiveMeetingNotesGenerator:
             "segments": transcript_segments
         }
 
+    def iter_segments(self, audio_path: str) -> Iterator[Dict]:
+        """Yields segment dicts as Whisper decodes them (decoding happens lazily, in the caller's thread)."""
+        if self.whisper is None:
+            raise RuntimeError("Whisper is not loaded on this instance (whisper_model=None).")
+
+        # Relaxed VAD parameters
+        segments, _ = self.whisper.transcribe(
+            audio_path,
+            beam_size=5,
+            vad_filter=True,
+            vad_parameters=dict(min_silence_duration_ms=500) 
+        )
+        for segment in segments:
+            m, s = divmod(int(segment.start), 60)
+            yield {"timestamp": f"{m:02d}:{s:02d}", "text": segment.text.strip(),
+                   "start": segment.start, "end": segment.end}
+
+    # --- STEP 1b: PROMPT COMPACTION ---
+    def compact(self, segments: List[Dict]) -> str:
+        """Shrinks the transcript sent to the LLM. `segments` (used by the PDF) are not modified."""
+        if not segments:
+            return ""
+        result = compact_transcript(segments, self.compaction)
+        logger.info(f"   [Compact] {result.summary()}")
+        return result.text
+
     # --- STEP 2: PIPELINE EXECUTION ---
-    def analyze_transcript(self, transcript: str) -> Dict:
-        print("\n" + "-"*60)
-        logger.info("🧠 STEP 2: AI PIPELINE (Sum -> Hindi -> MOM -> Actions)")
-        print("-"*60)
+    def analyze_transcript(self, transcript: str,
+                           on_partial: Optional[Callable[[str, str], None]] = None) -> Dict:
+        """
+        `on_partial(key, text)` reports summary_en as soon as it has streamed (from the LLM thread)
+        and each summary_<lang> as it is collected; every call happens before this returns.
+        """
+        self._print("\n" + "-"*60)
+        logger.info("🧠 STEP 2: AI PIPELINE (Sum -> MOM -> Actions || Translation)")
+        self._print("-"*60)
         
         if not transcript:
-            return {"detected_context": "No Audio", "summary_en": "No speech detected.", "summary_hi": "-", "mom": [], "actions": []}
+            empty = {"detected_context": "No Audio", "summary_en": "No speech detected.", "mom": [], "actions": []}
+            empty.update({f"summary_{lang}": "-" for lang in self.languages})
+            return empty
 
         # --- UPDATED PROMPT TO CATCH 'HIDDEN' ACTIONS ---
+        # summary_en is requested FIRST so translation can start while MOM/actions are still streaming.
         prompt = f"""
         You are an expert Meeting Secretary. Follow this pipeline STRICTLY:
 
@@ -161,19 +264,17 @@ class AdaptiveMeetingNotesGenerator:
         YOUR TASKS (Execute in order):
         1. **Analyze Context**: Identify the main topic and speakers.
         2. **English Summary**: Write a comprehensive executive summary (4-5 sentences).
-        3. **Hindi Translation**: Translate the English summary from Step 2 into Hindi (Devanagari).
-        4. **MOM (Minutes)**: Extract general discussion points.
-        5. **Action Plan (CRITICAL)**: EXTRACT ALL TASKS AND DEADLINES.
+        3. **MOM (Minutes)**: Extract general discussion points.
+        4. **Action Plan (CRITICAL)**: EXTRACT ALL TASKS AND DEADLINES.
            - **IMPORTANT**: If a speaker says "I have to do this by [Date]" or "This is due [Date]", treat it as an ACTION ITEM, not just a minute.
            - Convert implied tasks into clear actions.
            - Extract the Task, the Owner (Speaker/Team), and the Deadline.
            - Example Input: "I have to do it by today." -> Action Output: {{ "task": "Complete the demo project", "owner": "Speaker", "deadline": "Today (2nd Feb)" }}
 
-        OUTPUT FORMAT: Provide ONLY this JSON structure.
+        OUTPUT FORMAT: Provide ONLY this JSON structure, keys in this order.
         {{
-            "detected_context": "Meeting Topic",
             "summary_en": "The meeting focused on...",
-            "summary_hi": "बैठक का मुख्य विषय...",
+            "detected_context": "Meeting Topic",
             "mom": ["Point 1", "Point 2", "Point 3"],
             "actions": [
                 {{ "task": "Submit Demo Project", "owner": "Student/Speaker", "deadline": "2nd February 2026" }},
@@ -182,38 +283,127 @@ class AdaptiveMeetingNotesGenerator:
         }}
         """
 
-        # 1. Try Gemini
+        # Translation stage: kicked off the moment summary_en is complete
+        pool = ThreadPoolExecutor(max_workers=max(1, len(self.languages)), thread_name_prefix="translate")
+        pending = {"summary": None, "futures": {}}
+
+        def start_translation(summary_en):
+            if summary_en == pending["summary"]:
+                return
+            pending["summary"] = summary_en
+            # Superseded by a newer summary (cloud failed -> local retry)
+            for stale in pending["futures"].values():
+                stale.cancel()
+            if on_partial:
+                on_partial("summary_en", summary_en)
+            if not self.languages:
+                return
+            logger.info(f"   [Translate] Summary ready -> translating to {', '.join(self.languages)} in parallel...")
+            pending["futures"] = {
+                lang: pool.submit(self.translator.translate, summary_en, lang, PDF_LANGUAGES[lang][0])
+                for lang in self.languages
+            }
+
+        try:
+            intel = self._run_analysis(prompt, start_translation)
+            if intel.get("summary_en"):
+                start_translation(intel["summary_en"])
+            for lang in self.languages:
+                future = pending["futures"].get(lang)
+                try:
+                    intel[f"summary_{lang}"] = future.result() if future else "-"
+                except Exception as e:
+                    logger.error(f"   ❌ Translation Error ({lang}): {e}")
+                    intel[f"summary_{lang}"] = "-"
+                # Reported here (not from a done-callback) so it always arrives before this returns
+                if on_partial and future and intel[f"summary_{lang}"] != "-":
+                    on_partial(f"summary_{lang}", intel[f"summary_{lang}"])
+        finally:
+            pool.shutdown(wait=False)
+        return intel
+
+    def _run_analysis(self, prompt: str, on_summary) -> Dict:
+        # 1. Try Gemini (streamed, so the summary is available before MOM/actions finish)
         if self.google_client:
-            try:
-                logger.info("   [Primary] Sending to Google Cloud...")
-                response = self.google_client.models.generate_content(
-                    model="gemini-1.5-flash-latest",
+            def call():
+                watcher = SummaryWatcher(on_summary)
+                stream = self.google_client.models.generate_content_stream(
+                    model=GEMINI_MODEL,
                     contents=prompt,
                     config=types.GenerateContentConfig(response_mime_type="application/json")
                 )
+                for chunk in stream:
+                    watcher.feed(chunk.text)
+                return json.loads(watcher.text)
+
+            try:
+                logger.info("   [Primary] Sending to Google Cloud...")
+                # Rough token budget: prompt (~4 chars/token) + room for the JSON answer
+                intel = self.cloud_scheduler.run(call, tokens=len(prompt) // 4 + 2048,
+                                                 local_estimate=self._local_estimate())
                 logger.info("   [Success] Google Cloud responded.")
-                return json.loads(response.text)
+                return intel
+            except PreferLocal as e:
+                logger.info(f"   [Quota] Local is faster right now ({e}).")
             except Exception as e:
                 logger.error(f"   ❌ Gemini Error: {e}")
 
         # 2. Try Local Ollama
-        if OLLAMA_AVAILABLE:
-            logger.info(f"   [Fallback] running on Local GPU ({OLLAMA_MODEL})...")
+        if self.local_llm:
+            state = "warm" if self.local_llm.is_warm else "still loading"
+            logger.info(f"   [Fallback] running on Local GPU ({OLLAMA_MODEL}, {state})...")
             try:
-                response = ollama.chat(model=OLLAMA_MODEL, messages=[
+                watcher = SummaryWatcher(on_summary)
+                stream = self.local_llm.chat(stream=True, messages=[
                     {'role': 'system', 'content': 'You are a JSON-only API. Output ONLY valid JSON.'},
                     {'role': 'user', 'content': prompt},
                 ])
+                for chunk in stream:
+                    watcher.feed(chunk['message']['content'])
                 
-                raw = response['message']['content']
-                clean = self._clean_json(raw)
+                clean = self._clean_json(watcher.text)
                 logger.info("   [Success] Local AI responded.")
+                self._record_local_latency()
                 return json.loads(clean)
             except Exception as e:
                 logger.error(f"   ❌ Local AI Error: {e}")
 
         return {}
 
+    def _local_estimate(self):
+        """Expected seconds for the local fallback, from shared history (None = unknown/unavailable)."""
+        if not self.local_llm:
+            return None
+        limiter = self.cloud_scheduler.limiter
+        estimate = limiter.expected_latency("ollama:analysis")
+        if estimate is not None and not self.local_llm.is_warm:
+            estimate += limiter.expected_latency("ollama:load") or 0.0
+        return estimate
+
+    def _record_local_latency(self):
+        stats = self.local_llm.last_stats
+        if not stats:
+            return
+        limiter = self.cloud_scheduler.limiter
+        limiter.record_latency("ollama:analysis", stats["wall_s"] - stats["load_s"])
+        if stats["load_s"] > 1:
+            limiter.record_latency("ollama:load", stats["load_s"])
+
+    # --- STEP 2b: CROSS-MEETING ACTION TRACKING ---
+    def track_actions(self, intel: Dict, meeting: str):
+        """Merges this meeting's actions into the persistent tracker and tags recurring ones."""
+        actions = [a for a in intel.get('actions', []) if isinstance(a, dict)]
+        if not actions or self.action_tracker is None:
+            return
+        try:
+            for a, r in zip(actions, self.action_tracker.record_meeting(meeting, actions)):
+                if r:
+                    a.update(tracker_id=r['id'], occurrences=r['occurrences'], first_seen=r['first_seen'][:10])
+            recurring = sum(1 for a in actions if a.get('occurrences', 1) > 1)
+            logger.info(f"   [Tracker] {len(actions)} action items stored ({recurring} recurring from earlier meetings).")
+        except Exception as e:
+            logger.error(f"   ❌ Action Tracker Error: {e}")
+
     def _clean_json(self, text):
         start = text.find('{')
         end = text.rfind('}')
@@ -222,12 +412,12 @@ class AdaptiveMeetingNotesGenerator:
         return text
 
     # --- STEP 3: PDF REPORT ---
-    def generate_pdf(self, intel: Dict, segments: List[Dict], filename: str):
-        print("\n" + "-"*60)
+    def generate_pdf(self, intel: Dict, segments: List[Dict], filename: str, output_dir: Path = None):
+        self._print("\n" + "-"*60)
         logger.info("📄 STEP 3: GENERATING PDF")
-        print("-"*60)
+        self._print("-"*60)
         
-        pdf_path = OUTPUT_DIR / f"{filename}.pdf"
+        pdf_path = Path(output_dir or OUTPUT_DIR) / f"{filename}.pdf"
         
         try:
             doc = SimpleDocTemplate(str(pdf_path), pagesize=letter)
@@ -237,7 +427,6 @@ class AdaptiveMeetingNotesGenerator:
             style_title = ParagraphStyle('T', parent=styles['Heading1'], fontSize=20, textColor=colors.navy, spaceAfter=20)
             style_h2 = ParagraphStyle('H2', parent=styles['Heading2'], fontSize=14, textColor=colors.black, spaceBefore=15, spaceAfter=5)
             style_body = ParagraphStyle('B', parent=styles['Normal'], fontSize=11, leading=14)
-            style_hindi = ParagraphStyle('Hi', parent=styles['Normal'], fontSize=11, fontName='HindiFont' if HINDI_AVAILABLE else 'Helvetica')
             style_action = ParagraphStyle('Act', parent=styles['Normal'], fontSize=11, leading=14, leftIndent=10)
 
             elements = []
@@ -251,9 +440,13 @@ class AdaptiveMeetingNotesGenerator:
             elements.append(Paragraph("EXECUTIVE SUMMARY (English)", style_h2))
             elements.append(Paragraph(intel.get('summary_en', 'N/A'), style_body))
             
-            # 2. SUMMARY (HINDI)
-            elements.append(Paragraph("EXECUTIVE SUMMARY (Hindi)", style_h2))
-            elements.append(Paragraph(intel.get('summary_hi', 'N/A'), style_hindi))
+            # 2. SUMMARY (TRANSLATIONS)
+            for lang in self.languages:
+                lang_name = PDF_LANGUAGES[lang][0]
+                style_lang = ParagraphStyle(f'S_{lang}', parent=styles['Normal'], fontSize=11, leading=16,
+                                            fontName=LANGUAGE_FONTS.get(lang, 'Helvetica'))
+                elements.append(Paragraph(f"EXECUTIVE SUMMARY ({lang_name})", style_h2))
+                elements.append(Paragraph(intel.get(f'summary_{lang}', 'N/A'), style_lang))
             elements.append(Spacer(1, 10))
 
             # 3. MOM
@@ -278,6 +471,8 @@ class AdaptiveMeetingNotesGenerator:
                     # Format: • Task Name
                     #           (Owner: X | Deadline: Y)
                     text = f"• <b>{task}</b> <br/>&nbsp;&nbsp;&nbsp;<i>(Owner: {owner} | Deadline: {deadline})</i>"
+                    if a.get('occurrences', 1) > 1:
+                        text += f" <font color='darkred'><i>Open since {a['first_seen']} ({a['occurrences']} meetings)</i></font>"
                     
                     elements.append(Paragraph(text, style_action))
                     elements.append(Spacer(1, 8)) # Slightly more space between actions
@@ -307,21 +502,32 @@ class AdaptiveMeetingNotesGenerator:
             return None
 
     def process(self, audio_file):
+        filename = Path(audio_file).stem + "_report"
+        # No-op unless RENA_PROFILE / --profile is set
+        profiler = StageProfiler(OUTPUT_DIR / f"{filename}_profile")
+
         # 1. Transcribe
-        res = self.transcribe(audio_file)
+        with profiler.stage("transcribe"):
+            res = self.transcribe(audio_file)
         
-        # 2. Analyze
-        intel = self.analyze_transcript(res['transcript'])
+        # 2. Analyze (on the compacted prompt text; the PDF keeps the full segments)
+        with profiler.stage("compact"):
+            prompt_text = self.compact(res['segments'])
+        with profiler.stage("analyze"):
+            intel = self.analyze_transcript(prompt_text)
+        self.track_actions(intel, filename)
         
         # 3. Generate PDF
-        filename = Path(audio_file).stem + "_report"
-        final_pdf = self.generate_pdf(intel, res['segments'], filename)
+        with profiler.stage("pdf"):
+            final_pdf = self.generate_pdf(intel, res['segments'], filename)
+        profiler.write_summary()
         
         if final_pdf:
-            print(f"\n🎉 SUCCESS! Report ready: {final_pdf}")
+            self._print(f"\n🎉 SUCCESS! Report ready: {final_pdf}")
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        AdaptiveMeetingNotesGenerator().process(sys.argv[1])
+    args = apply_cli_flags(sys.argv[1:])
+    if args:
+        AdaptiveMeetingNotesGenerator().process(args[0])
     else:
-        print("Usage: python meeting_notes_generator.py <file.wav>")
+        print("Usage: python meeting_notes_generator.py <file.wav> [--profile | --speedscope]")
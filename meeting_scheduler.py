@@ -0,0 +1,229 @@
+import re
+import json
+import time
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9
+    ZoneInfo = None
+
+MEET_URL = re.compile(r"https://meet\.google\.com/[a-z]{3}-[a-z]{4}-[a-z]{3}")
+METRICS_FILE = Path("meeting_outputs") / "scheduler_metrics.jsonl"
+WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+# --- ICS PARSING (no external dependency) ---
+
+def _unfold(text: str) -> List[str]:
+    lines = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+    return lines
+
+
+def _parse_dt(value: str, params: Dict[str, str]) -> Optional[datetime]:
+    """
+    Returns the datetime in its own zone (UTC for "Z", the TZID zone, or naive for floating
+    local time), or None for all-day (DATE) values. Recurrences are expanded in that zone,
+    so wall-clock times survive DST changes; use _to_utc() for comparisons.
+    """
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return None
+    dt = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        return dt.replace(tzinfo=timezone.utc)
+    tzid = params.get("TZID")
+    if tzid and ZoneInfo:
+        try:
+            return dt.replace(tzinfo=ZoneInfo(tzid))
+        except Exception:
+            pass
+    return dt  # floating time = local machine time
+
+
+def _to_utc(dt: datetime) -> datetime:
+    # Naive datetimes are interpreted as local time (with the local DST rules for that date)
+    return dt.astimezone(timezone.utc)
+
+
+def _split_prop(line: str):
+    head, _, value = line.partition(":")
+    name, *raw_params = head.split(";")
+    params = dict(p.split("=", 1) for p in raw_params if "=" in p)
+    return name.upper(), params, value
+
+
+def parse_ics(text: str) -> List[Dict]:
+    events, current = [], None
+    for line in _unfold(text):
+        if line == "BEGIN:VEVENT":
+            current = {"exdates": set()}
+        elif line == "END:VEVENT" and current is not None:
+            events.append(current)
+            current = None
+        elif current is not None and ":" in line:
+            name, params, value = _split_prop(line)
+            if name in ("DTSTART", "DTEND"):
+                current[name.lower()] = _parse_dt(value, params)
+            elif name == "EXDATE":
+                current["exdates"].update(_parse_dt(v, params) for v in value.split(","))
+            elif name == "RRULE":
+                current["rrule"] = dict(p.split("=", 1) for p in value.split(";") if "=" in p)
+            elif name in ("UID", "SUMMARY", "STATUS"):
+                current[name.lower()] = value
+            elif name in ("URL", "LOCATION", "DESCRIPTION", "X-GOOGLE-CONFERENCE"):
+                match = MEET_URL.search(value.replace("\\n", " "))
+                if match and "meet_url" not in current:
+                    current["meet_url"] = match.group(0)
+    return events
+
+
+def _occurrences(event: Dict, window_start: datetime, window_end: datetime):
+    """Expands DAILY/WEEKLY RRULEs (INTERVAL, COUNT, UNTIL, BYDAY) inside the window."""
+    start = event["dtstart"]
+    rule = event.get("rrule")
+    freq = (rule or {}).get("FREQ")
+    if freq not in ("DAILY", "WEEKLY"):
+        if window_start <= _to_utc(start) <= window_end:
+            yield _to_utc(start)
+        return
+    interval = int(rule.get("INTERVAL", 1))
+    count = int(rule["COUNT"]) if "COUNT" in rule else None
+    until = _parse_dt(rule["UNTIL"], {}) if "UNTIL" in rule else None
+    byday = {WEEKDAYS.index(d[-2:]) for d in rule.get("BYDAY", "").split(",") if d[-2:] in WEEKDAYS}
+    if freq == "WEEKLY" and not byday:
+        byday = {start.weekday()}
+
+    exdates = {_to_utc(d) for d in event["exdates"] if d is not None}
+
+    # Step by calendar days in the event's own zone: `day` keeps its wall-clock time and
+    # weekday across DST changes, and is converted to UTC only for comparison/output.
+    n, day = 0, start
+    while _to_utc(day) <= window_end and (until is None or _to_utc(day) <= _to_utc(until)):
+        delta_days = (day.date() - start.date()).days
+        if freq == "DAILY":
+            hit = delta_days % interval == 0
+        else:
+            # Weeks are counted from the Monday of DTSTART's week (RFC 5545 default WKST=MO)
+            hit = (delta_days + start.weekday()) // 7 % interval == 0 and day.weekday() in byday
+        if hit:
+            n += 1
+            if count is not None and n > count:
+                return
+            occurrence = _to_utc(day)
+            if occurrence >= window_start and occurrence not in exdates:
+                yield occurrence
+        day += timedelta(days=1)
+
+
+def load_upcoming(source: Path, horizon_h: float = 24, grace_s: float = 300) -> List[Dict]:
+    """Meetings with a Meet link starting within the horizon, from one .ics file or a folder of them."""
+    source = Path(source)
+    files = sorted(source.glob("*.ics")) if source.is_dir() else [source]
+    now = datetime.now(timezone.utc)
+    window_start, window_end = now - timedelta(seconds=grace_s), now + timedelta(hours=horizon_h)
+
+    meetings = []
+    for f in files:
+        try:
+            events = parse_ics(f.read_text(encoding="utf-8", errors="ignore"))
+        except OSError:
+            continue
+        for ev in events:
+            if not ev.get("dtstart") or not ev.get("meet_url") or ev.get("status") == "CANCELLED":
+                continue
+            for start in _occurrences(ev, window_start, window_end):
+                meetings.append({
+                    "key": f"{ev.get('uid', ev['meet_url'])}@{start.isoformat()}",
+                    "title": ev.get("summary", "Meeting"),
+                    "meet_url": ev["meet_url"],
+                    "start": start,
+                })
+    return sorted(meetings, key=lambda m: m["start"])
+
+
+# --- SCHEDULER ---
+
+class MeetingScheduler:
+    """
+    Watches ICS calendars and, `lead_s` before each meeting, launches + stealth-patches
+    a browser, prepares the lobby and pre-warms the notes generator, then clicks Join
+    exactly at the start time. Logs how much join latency the pre-warm absorbed.
+    """
+
+    def __init__(self, calendar_source, lead_s: float = 120, poll_s: float = 30,
+                 horizon_h: float = 24, bot_name: str = "Rena AI (Note Taker)"):
+        self.source = Path(calendar_source)
+        self.lead_s = lead_s
+        self.poll_s = poll_s
+        self.horizon_h = horizon_h
+        self.bot_name = bot_name
+        self.launched = set()
+        self._warm_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        self._generator = None
+        self._lock = threading.Lock()
+
+    def _prewarm_generator(self):
+        """One shared generator (Whisper + Ollama warm-up) started in the background."""
+        with self._lock:
+            if self._generator is None:
+                from meeting_notes_generator import AdaptiveMeetingNotesGenerator
+                print("🔥 Pre-warming notes generator...")
+                self._generator = self._warm_pool.submit(AdaptiveMeetingNotesGenerator)
+            return self._generator
+
+    def run_forever(self):
+        print(f"📅 Scheduler ON: watching {self.source} (lead time {self.lead_s:.0f}s)")
+        while True:
+            meetings = load_upcoming(self.source, self.horizon_h)
+            now = time.time()
+            for m in meetings:
+                start = m["start"].timestamp()
+                if m["key"] in self.launched or now < start - self.lead_s:
+                    continue
+                self.launched.add(m["key"])
+                print(f"🗓️  '{m['title']}' at {m['start'].astimezone():%H:%M} -> warming up now.")
+                threading.Thread(target=self._attend, args=(m,), daemon=False).start()
+
+            next_leads = [m["start"].timestamp() - self.lead_s for m in meetings if m["key"] not in self.launched]
+            sleep = min([self.poll_s] + [max(1.0, t - time.time()) for t in next_leads])
+            time.sleep(sleep)
+
+    def _attend(self, meeting: Dict):
+        from rena_bot_pilot import RenaMeetingBot
+        generator = self._prewarm_generator()
+        bot = RenaMeetingBot(self.bot_name, generator_factory=generator.result)
+        warm_start = time.time()
+        try:
+            bot.join_google_meet(meeting["meet_url"], join_at=meeting["start"].timestamp())
+        finally:
+            self._report(meeting, bot.timings, warm_start)
+
+    def _report(self, meeting: Dict, timings: Dict, warm_start: float):
+        if "join_clicked_at" not in timings:
+            return
+        start = meeting["start"].timestamp()
+        absorbed = timings.get("launch_s", 0) + timings.get("lobby_s", 0)
+        metrics = {
+            "meeting": meeting["title"],
+            "scheduled_start": meeting["start"].isoformat(),
+            "prewarm_started_s_before": round(start - warm_start, 2),
+            "join_latency_s": round(timings["join_clicked_at"] - start, 2),
+            "cold_path_s": round(absorbed, 2),
+            "saved_s": round(min(absorbed, max(0.0, start - warm_start)), 2),
+            **{k: round(v, 2) for k, v in timings.items() if k.endswith("_s")},
+        }
+        print(f"⏱️  Joined {metrics['join_latency_s']:+.1f}s from start; "
+              f"pre-warm saved {metrics['saved_s']:.1f}s (browser {timings.get('launch_s', 0):.1f}s, "
+              f"lobby {timings.get('lobby_s', 0):.1f}s).")
+        METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(METRICS_FILE, "a", encoding="utf-8") as f:
+            f.write(json.dumps(metrics) + "\n")
@@ -0,0 +1,193 @@
+import io
+import os
+import sys
+import time
+import shutil
+import signal
+import threading
+import pstats
+import cProfile
+import subprocess
+import tracemalloc
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+# RENA_PROFILE=1 -> cProfile + tracemalloc per stage; RENA_PROFILE=speedscope -> also py-spy speedscope output.
+# Set by the --profile / --speedscope CLI flags so child processes (bot -> generator) inherit it.
+PROFILE_ENV = "RENA_PROFILE"
+
+_NULL = contextlib.nullcontext()
+
+# tracemalloc and cProfile are process-global, but the scheduler runs several bots (each with its
+# own profiler) in one process. tracemalloc is refcounted across overlapping stages; only one
+# cProfile runs at a time (a second enable() raises on 3.12+), later overlapping stages skip it.
+_state_lock = threading.Lock()
+_tracing_users = 0
+_cprofile_lock = threading.Lock()
+
+
+def _tracemalloc_acquire():
+    global _tracing_users
+    with _state_lock:
+        if _tracing_users == 0:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+            tracemalloc.reset_peak()  # peak is process-wide: only reset when nobody else is measuring
+        _tracing_users += 1
+        return tracemalloc.take_snapshot()
+
+
+def _tracemalloc_release():
+    global _tracing_users
+    with _state_lock:
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+        return snapshot, peak
+
+
+def profile_mode_from_env() -> Dict[str, bool]:
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return {"enabled": value not in ("", "0", "false", "off"), "speedscope": value == "speedscope"}
+
+
+def apply_cli_flags(argv: List[str]) -> List[str]:
+    """Consumes --profile / --speedscope from argv (into the env) and returns the remaining args."""
+    rest = [a for a in argv if a not in ("--profile", "--speedscope")]
+    if "--speedscope" in argv:
+        os.environ[PROFILE_ENV] = "speedscope"
+    elif "--profile" in argv:
+        os.environ[PROFILE_ENV] = "1"
+    return rest
+
+
+class StageProfiler:
+    """
+    Opt-in per-stage profiling. When disabled, stage() returns a shared nullcontext,
+    so the cost is one attribute check per stage.
+
+    Enabled, each stage writes:
+      <out_dir>/<stage>.prof             cProfile stats (snakeviz / pstats)
+      <out_dir>/<stage>.speedscope.json  py-spy sampling profile, all threads (speedscope mode only)
+    and summary.txt collects the top-N hotspots and allocation sites per stage.
+    cProfile only sees the calling thread; use speedscope mode for thread-pool work. When stages of
+    several profilers overlap (concurrent bots), only the first gets a .prof and peak memory is process-wide.
+    """
+
+    def __init__(self, out_dir: Path, enabled: Optional[bool] = None, speedscope: Optional[bool] = None,
+                 top_n: int = 15):
+        mode = profile_mode_from_env()
+        self.enabled = mode["enabled"] if enabled is None else enabled
+        self.speedscope = mode["speedscope"] if speedscope is None else speedscope
+        self.out_dir = Path(out_dir)
+        self.top_n = top_n
+        self.sections: List[str] = []
+        self.timings: Dict[str, float] = {}
+        self._open = None
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return self._profile(name)
+
+    def start(self, name: str):
+        """Non-`with` form for long linear flows (the bot). Closes any stage still open."""
+        if not self.enabled:
+            return
+        self.stop()
+        self._open = self._profile(name)
+        self._open.__enter__()
+
+    def stop(self):
+        if self._open is not None:
+            stage, self._open = self._open, None
+            stage.__exit__(None, None, None)
+
+    @contextlib.contextmanager
+    def _profile(self, name: str):
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        before = _tracemalloc_acquire()
+        spy = self._start_py_spy(name) if self.speedscope else None
+
+        profiler = cProfile.Profile() if _cprofile_lock.acquire(blocking=False) else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+                _cprofile_lock.release()
+            elapsed = time.perf_counter() - start
+            after, peak = _tracemalloc_release()
+            self._stop_py_spy(spy)
+
+            if profiler:
+                profiler.dump_stats(str(self.out_dir / f"{name}.prof"))
+            self.timings[name] = elapsed
+            self.sections.append(self._summarize(name, profiler, before, after, elapsed, peak))
+            logger.info(f"   [Profile] {name}: {elapsed:.2f}s, peak {peak / 1e6:.1f} MB")
+
+    def _summarize(self, name, profiler, before, after, elapsed, peak) -> str:
+        out = io.StringIO()
+        out.write(f"=== {name} | {elapsed:.3f}s wall | peak traced {peak / 1e6:.1f} MB ===\n\n")
+        out.write(f"-- Top {self.top_n} hotspots (cumulative) --\n")
+        if profiler:
+            pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(self.top_n)
+        else:
+            out.write("(skipped: another stage in this process was being cProfiled; use speedscope mode)\n\n")
+        out.write(f"-- Top {self.top_n} allocation sites (net growth) --\n")
+        for stat in after.compare_to(before, "lineno")[:self.top_n]:
+            out.write(f"{stat}\n")
+        return out.getvalue()
+
+    def write_summary(self) -> Optional[Path]:
+        self.stop()
+        if not self.enabled or not self.sections:
+            return None
+        path = self.out_dir / "summary.txt"
+        total = sum(self.timings.values())
+        header = "STAGE TIMINGS\n" + "".join(
+            f"  {name:<20} {secs:8.2f}s  {100 * secs / total if total else 0:5.1f}%\n"
+            for name, secs in self.timings.items()
+        )
+        path.write_text(header + "\n" + "\n".join(self.sections), encoding="utf-8")
+        logger.info(f"   [Profile] Summary: {path}")
+        return path
+
+    # --- py-spy (optional, external) ---
+
+    def _start_py_spy(self, name: str):
+        exe = shutil.which("py-spy")
+        if not exe:
+            logger.warning("   ⚠️ py-spy not found on PATH; skipping speedscope output.")
+            return None
+        out = self.out_dir / f"{name}.speedscope.json"
+        cmd = [exe, "record", "--pid", str(os.getpid()), "--format", "speedscope",
+               "--output", str(out), "--rate", "100", "--threads"]
+        try:
+            proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            time.sleep(0.2)  # let it attach before the stage starts
+            return proc
+        except OSError as e:
+            logger.warning(f"   ⚠️ py-spy failed to start: {e}")
+            return None
+
+    def _stop_py_spy(self, proc):
+        if proc is None:
+            return
+        # py-spy writes the file when interrupted; Windows has no SIGINT for child processes
+        if sys.platform == "win32":
+            proc.terminate()
+        else:
+            proc.send_signal(signal.SIGINT)
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
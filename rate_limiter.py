@@ -0,0 +1,191 @@
+import re
+import time
+import random
+import sqlite3
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+
+class PreferLocal(Exception):
+    """Raised when waiting for cloud quota is expected to be slower than the local model."""
+
+
+def is_rate_limit_error(e: Exception) -> bool:
+    # Structured fields only: a bare "429" in the message may just be a token count or byte offset
+    code = getattr(e, "code", None) or getattr(e, "status_code", None)
+    return code == 429 or getattr(e, "status", None) == "RESOURCE_EXHAUSTED" or "RESOURCE_EXHAUSTED" in str(e)
+
+
+def retry_after_hint(e: Exception) -> Optional[float]:
+    """Gemini puts a retryDelay like '17s' into 429 error details."""
+    match = re.search(r"retry[_ ]?delay['\"]?\s*[:=]\s*['\"]?(\d+(?:\.\d+)?)s", str(e), re.I)
+    return float(match.group(1)) if match else None
+
+
+# --- SHARED TOKEN BUCKET ---
+
+class QuotaLease:
+    def __init__(self, limiter: "QuotaLimiter", tokens: int, wait: float):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.wait = wait
+        self.released = False
+
+    def release(self):
+        """Hands the reserved slot back (e.g. the caller decided to go local instead)."""
+        if not self.released:
+            self.limiter._refund(self.tokens)
+            self.released = True
+
+
+class QuotaLimiter:
+    """
+    Token bucket on requests/min AND tokens/min, shared by every process on the box
+    through one SQLite file. Implemented as GCRA: each reservation pushes a
+    "theoretical arrival time" forward, so concurrent callers queue up in FIFO order
+    and each one learns exactly how long it must wait.
+    """
+
+    WINDOW = 60.0  # seconds; limits are per minute, a full minute of burst is allowed
+
+    def __init__(self, db_path: Path, name: str, rpm: int, tpm: int):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.name = name
+        self.limits = {"req": rpm, "tok": tpm}
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS bucket (
+                    name TEXT NOT NULL, dim TEXT NOT NULL, tat REAL NOT NULL,
+                    PRIMARY KEY (name, dim)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS latency (
+                    name TEXT PRIMARY KEY, ema REAL NOT NULL, n INTEGER NOT NULL
+                )
+            """)
+
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return _Txn(conn)
+
+    def reserve(self, tokens: int) -> QuotaLease:
+        """Atomically books one request + `tokens` tokens. Returns the lease and its wait."""
+        now = time.time()
+        wait = 0.0
+        with self._connect() as conn:
+            for dim, cost in (("req", 1), ("tok", tokens)):
+                interval = self.WINDOW / max(1, self.limits[dim])
+                tat = self._tat(conn, dim, now)
+                new_tat = max(tat, now) + cost * interval
+                wait = max(wait, new_tat - self.WINDOW - now)
+                conn.execute("INSERT OR REPLACE INTO bucket (name, dim, tat) VALUES (?, ?, ?)",
+                             (self.name, dim, new_tat))
+        return QuotaLease(self, tokens, max(0.0, wait))
+
+    def _refund(self, tokens: int):
+        now = time.time()
+        with self._connect() as conn:
+            for dim, cost in (("req", 1), ("tok", tokens)):
+                interval = self.WINDOW / max(1, self.limits[dim])
+                tat = self._tat(conn, dim, now)
+                conn.execute("UPDATE bucket SET tat = ? WHERE name = ? AND dim = ?",
+                             (max(now, tat - cost * interval), self.name, dim))
+
+    def penalize(self, seconds: float):
+        """Server said 429: nobody on this box should try again for `seconds`."""
+        until = time.time() + seconds + self.WINDOW
+        with self._connect() as conn:
+            for dim in ("req", "tok"):
+                tat = self._tat(conn, dim, 0)
+                conn.execute("INSERT OR REPLACE INTO bucket (name, dim, tat) VALUES (?, ?, ?)",
+                             (self.name, dim, max(tat, until)))
+
+    def _tat(self, conn, dim: str, default: float) -> float:
+        row = conn.execute("SELECT tat FROM bucket WHERE name = ? AND dim = ?", (self.name, dim)).fetchone()
+        return row[0] if row else default
+
+    # --- LATENCY HISTORY (shared, used for wait-vs-fallback decisions) ---
+
+    def record_latency(self, key: str, seconds: float, alpha: float = 0.3):
+        with self._connect() as conn:
+            row = conn.execute("SELECT ema, n FROM latency WHERE name = ?", (key,)).fetchone()
+            ema = seconds if not row else alpha * seconds + (1 - alpha) * row[0]
+            conn.execute("INSERT OR REPLACE INTO latency (name, ema, n) VALUES (?, ?, ?)",
+                         (key, ema, (row[1] if row else 0) + 1))
+
+    def expected_latency(self, key: str) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT ema FROM latency WHERE name = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+
+class _Txn:
+    """BEGIN IMMEDIATE ... COMMIT: takes the write lock up front so read-modify-write is atomic across processes."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        self.conn.close()
+
+
+# --- REQUEST SCHEDULER ---
+
+class CloudRequestScheduler:
+    """
+    Queues cloud calls through the shared limiter, retries rate-limit errors with
+    full-jitter exponential backoff, and raises PreferLocal whenever the expected
+    cloud latency (queue wait + typical response time) exceeds the local estimate.
+    """
+
+    def __init__(self, limiter: QuotaLimiter, max_retries: int = 4,
+                 base_backoff: float = 2.0, max_backoff: float = 60.0):
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+    def run(self, call: Callable[[], object], tokens: int, local_estimate: Optional[float] = None):
+        """`local_estimate`: expected seconds on the local model; None = no known local option, always wait."""
+        cloud_latency = self.limiter.expected_latency(f"{self.limiter.name}:cloud") or 0.0
+
+        for attempt in range(self.max_retries + 1):
+            lease = self.limiter.reserve(tokens)
+            if local_estimate is not None and lease.wait + cloud_latency > local_estimate:
+                lease.release()
+                raise PreferLocal(f"cloud ~{lease.wait + cloud_latency:.0f}s vs local ~{local_estimate:.0f}s")
+            if lease.wait > 0:
+                logger.info(f"   [Quota] Queued for {lease.wait:.1f}s (shared {self.limiter.name} limit)...")
+                time.sleep(lease.wait)
+
+            start = time.time()
+            try:
+                result = call()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                hint = retry_after_hint(e)
+                if hint:
+                    # Server told us when: block the shared bucket, the next reserve() does the waiting
+                    logger.warning(f"   ⚠️ Rate limited (attempt {attempt + 1}), server asks for {hint:.0f}s.")
+                    self.limiter.penalize(hint)
+                    continue
+                backoff = random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+                if local_estimate is not None and backoff + cloud_latency > local_estimate:
+                    raise PreferLocal(f"rate limited, retry in {backoff:.0f}s vs local ~{local_estimate:.0f}s")
+                logger.warning(f"   ⚠️ Rate limited (attempt {attempt + 1}), backing off {backoff:.1f}s...")
+                time.sleep(backoff)
+                continue
+
+            self.limiter.record_latency(f"{self.limiter.name}:cloud", time.time() - start)
+            return result
@@ -5,12 +5,17 @@ import subprocess
 import threading
 import signal
 import re
+import shutil
+import uuid
 from pathlib import Path
 from datetime import datetime
 from playwright.sync_api import sync_playwright
 from playwright_stealth import Stealth
 import pyperclip
 
+from profiling import StageProfiler, apply_cli_flags
+from linux_capture import PulseNullSink, HEADLESS_ARGS, HEADLESS_VIEWPORT, VIDEO_OFF_SCRIPT, ffmpeg_pulse_command, clone_profile
+
 # --- HELPER FUNCTIONS ---
 
 def is_meet_url(text: str) -> bool:
@@ -41,8 +46,17 @@ class RenaMeetingBot:
     Rena AI Meeting Bot v1.4 (Robust Audio Setup)
     """
     
-    def __init__(self, bot_name="Rena AI (Note Taker)"):
+    def __init__(self, bot_name="Rena AI (Note Taker)", generator_factory=None, backend=None):
         self.bot_name = bot_name
+        # "windows": headed Chrome + VB-Cable + dshow. "linux": headless Chrome + per-meeting PulseAudio sink.
+        self.backend = backend or ("linux" if sys.platform.startswith("linux") else "windows")
+        # Unique per bot: concurrent meetings (scheduler, same process) can start in the same second
+        self.session_id = uuid.uuid4().hex[:8]
+        self.sink = None
+        self.profile_dir = None
+        # Lets the scheduler hand over a notes generator it pre-warmed before the meeting
+        self.generator_factory = generator_factory or AdaptiveMeetingNotesGenerator
+        self.timings = {}
         self.output_dir = Path("meeting_outputs") / "recordings"
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.is_recording = False
@@ -65,6 +79,8 @@ class RenaMeetingBot:
     def start_audio_recording(self, filename):
         """Starts FFmpeg with auto-device detection and signal boost."""
         self.recording_path = self.output_dir / f"{filename}.wav"
+        if self.backend == "linux":
+            return self._start_linux_recording()
         
         # Discover FFmpeg
         ffmpeg_exe = "ffmpeg"
@@ -104,11 +120,30 @@ class RenaMeetingBot:
             print(f"❌ FAILED TO START RECORDING: {e}")
             self.is_recording = False
 
+    def _start_linux_recording(self):
+        """Records the meeting's own null-sink monitor (no VB-Cable, no shared device)."""
+        command = ffmpeg_pulse_command("ffmpeg", self.sink, self.recording_path)
+        print(f"🎙️ Target Device: {self.sink.monitor}")
+        print(f"🎙️ Starting recording: {self.recording_path}")
+        try:
+            self.audio_process = subprocess.Popen(
+                command,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+            self.is_recording = True
+        except Exception as e:
+            print(f"❌ FAILED TO START RECORDING: {e}")
+            self.is_recording = False
+
     def stop_audio_recording(self):
         """Gracefully stops the FFmpeg process."""
         if self.audio_process:
             print("🛑 Stopping recording...")
-            self.audio_process.send_signal(signal.CTRL_BREAK_EVENT)
+            # SIGINT lets ffmpeg finalize the WAV header on Linux; Windows needs CTRL_BREAK
+            stop_signal = signal.SIGINT if self.backend == "linux" else signal.CTRL_BREAK_EVENT
+            self.audio_process.send_signal(stop_signal)
             self.audio_process.wait()
             self.is_recording = False
             print(f"✅ Recording saved to: {self.recording_path}")
@@ -138,11 +173,14 @@ class RenaMeetingBot:
             except Exception:
                 print("✅ Browser closed. Login session saved!")
 
-    def join_google_meet(self, meet_url):
-        """Launches browser and handles the joining flow."""
-        with sync_playwright() as p:
-            user_data_dir = os.path.join(os.getcwd(), "bot_session")
-            
+    def launch_browser(self, p):
+        """Launches the persistent Chromium context and stealth-patches its page."""
+        start = time.time()
+        user_data_dir = os.path.join(os.getcwd(), "bot_session")
+        
+        if self.backend == "linux":
+            context = self._launch_linux_context(p, user_data_dir)
+        else:
             context = p.chromium.launch_persistent_context(
                 user_data_dir,
                 headless=False,
@@ -154,12 +192,114 @@ class RenaMeetingBot:
                     "--disable-blink-features=AutomationControlled"
                 ]
             )
-            
+        
+        try:
+            if self.backend == "linux":
+                context.add_init_script(VIDEO_OFF_SCRIPT)
             page = context.pages[0] if context.pages else context.new_page()
             stealth = Stealth()
             stealth.apply_stealth_sync(page)
+        except Exception:
+            try: context.close()
+            except: pass
+            self._release_linux_resources()
+            raise
+        self.timings["launch_s"] = time.time() - start
+        return context, page
+
+    def _launch_linux_context(self, p, user_data_dir):
+        """Headless Chrome playing into a dedicated null sink, with video decode/render minimized."""
+        try:
+            self.sink = PulseNullSink(f"rena_{os.getpid()}_{self.session_id}").create()
+            self.profile_dir = clone_profile(user_data_dir)
+            print(f"🔈 Audio sink: {self.sink.name} (headless)")
+            context = p.chromium.launch_persistent_context(
+                self.profile_dir,
+                headless=False,  # real headless mode comes from --headless=new in HEADLESS_ARGS
+                viewport=HEADLESS_VIEWPORT,
+                env=self.sink.browser_env(),
+                user_agent="Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+                args=HEADLESS_ARGS + [
+                    "--use-fake-ui-for-media-stream",
+                    "--use-fake-device-for-media-stream",
+                    "--disable-blink-features=AutomationControlled"
+                ]
+            )
+        except Exception:
+            # Runs before join_google_meet's try/finally, so don't leak the sink module / profile copy
+            self._release_linux_resources()
+            raise
+        return context
+
+    def _release_linux_resources(self):
+        if self.sink:
+            self.sink.remove()
+            self.sink = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+    def route_audio_to_cable(self, page):
+        """Points Meet's speaker output at VB-CABLE (Windows backend)."""
+        try:
+            print("⚙️ Auto-configuring audio output to VB-CABLE...")
+            # 1. Open Options Menu
+            page.wait_for_selector('button[aria-label="More options"]', timeout=5000).click()
+
+            # 2. Click Settings
+            page.wait_for_selector('li[role="menuitem"]:has-text("Settings")', timeout=5000).click()
+            time.sleep(2) # Allow modal to animate
+
+            # 3. Ensure we are on the Audio Tab
+            try: page.click('li[role="tab"]:has-text("Audio")', timeout=2000)
+            except: pass 
+
+            # 4. Click Speakers Dropdown
+            page.click('[aria-label="Speakers"]', timeout=5000)
+            time.sleep(1)
+
+            # 5. Smart Search for Cable
+            # We try to scroll down just in case it's hidden
+            page.keyboard.press("ArrowDown")
+            page.keyboard.press("ArrowDown")
+
+            # Look for ANY text containing "CABLE" (Partial match is safer)
+            cable_option = page.locator('li[role="option"]').filter(has_text="CABLE").first
+
+            if cable_option.is_visible():
+                cable_option.click()
+                print("✅ Speaker successfully set to Virtual Cable.")
+            else:
+                print("⚠️ Could not find 'CABLE' in the list automatically.")
+                raise Exception("Cable option not visible")
+
+            # Close Settings
+            page.keyboard.press("Escape")
+
+        except Exception as e:
+            print("\n" + "!"*50)
+            print(f"⚠️  AUTO SETUP FAILED: {e}")
+            print("👉 ACTION REQUIRED: Please Manually set Speaker to 'VB-Cable' NOW.")
+            print("👉 Do NOT close this window. Just change the setting.")
+            print("!"*50 + "\n")
+            # Try to close menu if stuck open
+            try: page.keyboard.press("Escape")
+            except: pass
+
+    def join_google_meet(self, meet_url, join_at=None):
+        """
+        Launches browser and handles the joining flow.
+        join_at (epoch seconds): prepare the lobby now, but only click Join at that moment.
+        """
+        # No-op unless RENA_PROFILE / --profile is set
+        profiler = StageProfiler(self.output_dir.parent / f"bot_{datetime.now():%Y%m%d_%H%M%S}_{self.session_id}_profile")
+        with sync_playwright() as p:
+            profiler.start("browser_launch")
+            context, page = self.launch_browser(p)
             
             print(f"🚀 Navigating to: {meet_url}")
+            profiler.start("lobby")
+            lobby_start = time.time()
             page.goto(meet_url)
             
             try:
@@ -170,13 +310,14 @@ class RenaMeetingBot:
                 try: page.click("text=Dismiss", timeout=3000)
                 except: pass
 
-                # Input Name
+                # Input Name (Enter would already send the join request, so hold it when scheduled)
                 try:
                     name_input = page.wait_for_selector('input[aria-label="Your name"], input[type="text"]', timeout=5000)
                     if name_input:
                         name_input.click()
                         name_input.fill(self.bot_name)
-                        page.keyboard.press("Enter")
+                        if join_at is None:
+                            page.keyboard.press("Enter")
                 except: pass
                 
                 # Turn off Cam/Mic
@@ -184,8 +325,17 @@ class RenaMeetingBot:
                 page.keyboard.press("Control+e")
                 page.keyboard.press("Control+d")
                 print("🔇 Camera and Mic toggled off.")
+                self.timings["lobby_s"] = time.time() - lobby_start
+                profiler.stop()
+
+                if join_at is not None:
+                    wait = join_at - time.time()
+                    if wait > 0:
+                        print(f"🕒 Lobby ready. Joining in {wait:.0f}s...")
+                        time.sleep(wait)
 
                 # Click Join
+                profiler.start("join_click")
                 join_selectors = [
                     'span:has-text("Ask to join")', 'span:has-text("Join now")',
                     'button:has-text("Ask to join")', 'button:has-text("Join now")'
@@ -195,60 +345,22 @@ class RenaMeetingBot:
                         page.locator(selector).first.click()
                         print("📩 Join request sent.")
                         break
+                self.timings["join_clicked_at"] = time.time()
 
+                profiler.start("admission")
                 print("⏳ Waiting for admission...")
                 page.wait_for_selector('button[aria-label="Leave call"]', timeout=300000) 
                 print("🎉 Bot is in the meeting.")
+                profiler.start("audio_setup")
 
-                # --- AUTO-CONFIGURE SPEAKER (ROBUST VERSION) ---
-                try:
-                    print("⚙️ Auto-configuring audio output to VB-CABLE...")
-                    # 1. Open Options Menu
-                    page.wait_for_selector('button[aria-label="More options"]', timeout=5000).click()
-                    
-                    # 2. Click Settings
-                    page.wait_for_selector('li[role="menuitem"]:has-text("Settings")', timeout=5000).click()
-                    time.sleep(2) # Allow modal to animate
-                    
-                    # 3. Ensure we are on the Audio Tab
-                    try: page.click('li[role="tab"]:has-text("Audio")', timeout=2000)
-                    except: pass 
-
-                    # 4. Click Speakers Dropdown
-                    page.click('[aria-label="Speakers"]', timeout=5000)
-                    time.sleep(1)
-                    
-                    # 5. Smart Search for Cable
-                    # We try to scroll down just in case it's hidden
-                    page.keyboard.press("ArrowDown")
-                    page.keyboard.press("ArrowDown")
-                    
-                    # Look for ANY text containing "CABLE" (Partial match is safer)
-                    cable_option = page.locator('li[role="option"]').filter(has_text="CABLE").first
-                    
-                    if cable_option.is_visible():
-                        cable_option.click()
-                        print("✅ Speaker successfully set to Virtual Cable.")
-                    else:
-                        print("⚠️ Could not find 'CABLE' in the list automatically.")
-                        raise Exception("Cable option not visible")
-                    
-                    # Close Settings
-                    page.keyboard.press("Escape")
-                    
-                except Exception as e:
-                    print("\n" + "!"*50)
-                    print(f"⚠️  AUTO SETUP FAILED: {e}")
-                    print("👉 ACTION REQUIRED: Please Manually set Speaker to 'VB-Cable' NOW.")
-                    print("👉 Do NOT close this window. Just change the setting.")
-                    print("!"*50 + "\n")
-                    # Try to close menu if stuck open
-                    try: page.keyboard.press("Escape")
-                    except: pass
+                # Route meeting audio into the recorder (Linux: already done via PULSE_SINK)
+                if self.backend == "windows":
+                    self.route_audio_to_cable(page)
 
                 # Start Recording
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                self.start_audio_recording(f"meeting_{timestamp}")
+                self.start_audio_recording(f"meeting_{timestamp}_{self.session_id}")
+                profiler.stop()
 
                 # Monitor Loop
                 while True:
@@ -263,16 +375,24 @@ class RenaMeetingBot:
                 self.stop_audio_recording()
                 try: context.close()
                 except: pass
+                self._release_linux_resources()
+                profiler.write_summary()
                 
                 if self.recording_path and os.path.exists(self.recording_path):
                     self.run_ai_pipeline()
 
     def run_ai_pipeline(self):
-        """Triggers the analysis pipeline."""
+        """Triggers the analysis pipeline (locally, or on the worker fleet if RENA_BROKER_DB/RENA_BROKER_URL is set)."""
         print("\n" + "="*60)
         print("🤖 STARTING AI ANALYSIS")
         print("="*60)
-        generator = AdaptiveMeetingNotesGenerator()
+        if os.environ.get("RENA_BROKER_DB") or os.environ.get("RENA_BROKER_URL"):
+            from worker_fleet import make_broker
+            broker = make_broker()
+            task_id = broker.register_recording(str(self.recording_path))
+            print(f"📤 Handed to worker fleet (task {task_id}). Report -> {broker.store / 'reports'}")
+            return
+        generator = self.generator_factory()
         generator.process(str(self.recording_path))
         print("🎉 COMPLETE!")
 
@@ -280,12 +400,22 @@ class RenaMeetingBot:
 # --- ENTRY POINT ---
 
 if __name__ == "__main__":
+    # --profile / --speedscope are removed here and passed on to the generator via RENA_PROFILE
+    sys.argv = [sys.argv[0]] + apply_cli_flags(sys.argv[1:])
     try:
         if len(sys.argv) > 1 and sys.argv[1] == "--setup":
             RenaMeetingBot().setup_mode()
             sys.exit(0)
 
-        if len(sys.argv) > 1 and sys.argv[1] == "--auto":
+        if len(sys.argv) > 1 and sys.argv[1] == "--calendar":
+            from meeting_scheduler import MeetingScheduler
+            if len(sys.argv) < 3:
+                print("Usage: python rena_bot_pilot.py --calendar <file.ics|folder> [lead_seconds]")
+                sys.exit(1)
+            lead = float(sys.argv[3]) if len(sys.argv) > 3 else 120
+            MeetingScheduler(sys.argv[2], lead_s=lead).run_forever()
+
+        elif len(sys.argv) > 1 and sys.argv[1] == "--auto":
             meet_url = wait_for_meet_link_from_clipboard()
             RenaMeetingBot().join_google_meet(meet_url)
 
@@ -0,0 +1,154 @@
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+# Pure hesitation sounds: never carry meaning in meeting minutes
+FILLER_WORDS = ["um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "hmm", "mm", "mhm"]
+# Discourse fillers: only dropped when set off by commas ("so, you know, we ship")
+FILLER_PHRASES = ["you know", "i mean", "like"]
+
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text) / CHARS_PER_TOKEN) + (1 if text else 0)
+
+
+@dataclass
+class CompactionConfig:
+    """Knobs for the prompt-side transcript. The stored transcript/PDF is never touched."""
+    enabled: bool = True
+    merge_gap_s: float = 2.0          # merge adjacent segments closer than this
+    max_block_s: float = 90.0         # ...but never build a block longer than this
+    timestamp_step_s: int = 60        # coarsen markers to this resolution, emit only when it changes
+    drop_fillers: bool = True
+    dedupe: bool = True
+    short_segment_words: int = 4      # "Okay." / "Thank you." repeats are dropped if this short
+    dedupe_window_s: float = 5.0      # ...and the same words were kept this few seconds earlier
+                                      # (a "Yes." to a later question is a different answer)
+    filler_words: List[str] = field(default_factory=lambda: list(FILLER_WORDS))
+    filler_phrases: List[str] = field(default_factory=lambda: list(FILLER_PHRASES))
+
+
+@dataclass
+class CompactionResult:
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    segments_in: int
+    blocks_out: int
+    dropped_segments: int
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.original_tokens - self.compacted_tokens
+
+    @property
+    def savings_pct(self) -> float:
+        return 100.0 * self.saved_tokens / self.original_tokens if self.original_tokens else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.original_tokens:,} -> {self.compacted_tokens:,} tokens "
+                f"(-{self.savings_pct:.0f}%), {self.segments_in} segments -> {self.blocks_out} blocks, "
+                f"{self.dropped_segments} repeats dropped")
+
+
+# --- TEXT CLEANUP ---
+
+# Repeated words/phrases ("we need to, we need to", "the the the"). Letters only, separated by
+# spaces/commas, so numbers ("3.3", "1.1", "555-555-1234") are never touched; a single word must
+# occur three times, since doubles like "had had" are often real grammar.
+_LETTERS = r"[^\W\d_]+"
+_REPEAT = re.compile(
+    rf"\b({_LETTERS}(?:\s+{_LETTERS}){{1,3}})(?:[\s,]+\1\b)+|\b({_LETTERS})(?:[\s,]+\2\b){{2,}}", re.I
+)
+_SPACES = re.compile(r"\s+([,.?!])|\s{2,}")
+
+
+def _filler_patterns(cfg: CompactionConfig):
+    words = "|".join(re.escape(w) for w in cfg.filler_words)
+    phrases = "|".join(re.escape(p) for p in cfg.filler_phrases)
+    patterns = []
+    if words:
+        patterns.append((re.compile(rf"(?:^|(?<=[\s,]))(?:{words})\b[,.]?\s*", re.I), ""))
+    if phrases:
+        patterns.append((re.compile(rf",\s*(?:{phrases}),\s*", re.I), " "))
+    return patterns
+
+
+def clean_text(text: str, cfg: CompactionConfig, patterns=None) -> str:
+    if cfg.drop_fillers:
+        for pattern, repl in (patterns if patterns is not None else _filler_patterns(cfg)):
+            text = pattern.sub(repl, text)
+    if cfg.dedupe:
+        text = _REPEAT.sub(lambda m: m.group(1) or m.group(2), text)
+    text = _SPACES.sub(lambda m: m.group(1) or " ", text).strip(" ,")
+    return text[:1].upper() + text[1:] if text else text
+
+
+def _norm(text: str) -> str:
+    return re.sub(r"[^\w\s]", "", text.lower()).strip()
+
+
+def _marker(seconds: float, step: int) -> str:
+    coarse = int(seconds) // step * step if step > 0 else int(seconds)
+    m, s = divmod(coarse, 60)
+    return f"[{m:02d}:{s:02d}]"
+
+
+# --- COMPACTION STAGE ---
+
+def compact_transcript(segments: List[Dict], cfg: CompactionConfig = None) -> CompactionResult:
+    """
+    Builds the LLM prompt text from transcribe() segments:
+    merge adjacent segments -> coarse timestamps -> drop disfluencies -> dedupe repeats.
+    """
+    cfg = cfg or CompactionConfig()
+    original = "\n".join(f"[{s['timestamp']}] {s['text']}" for s in segments)
+
+    if not cfg.enabled or not segments:
+        tokens = estimate_tokens(original)
+        return CompactionResult(original, tokens, tokens, len(segments), len(segments), 0)
+
+    patterns = _filler_patterns(cfg)
+    blocks = []          # [start, end, [texts]]
+    recent = {}          # normalised short segment -> end time when last kept
+    dropped = 0
+
+    for seg in segments:
+        text = clean_text(seg["text"], cfg, patterns)
+        if not text:
+            dropped += 1
+            continue
+
+        norm = _norm(text)
+        start = seg.get("start", 0.0)
+        end = seg.get("end", start)
+        if cfg.dedupe and len(norm.split()) <= cfg.short_segment_words:
+            if norm in recent and start - recent[norm] <= cfg.dedupe_window_s:
+                dropped += 1
+                continue
+            recent[norm] = end
+        if blocks and start - blocks[-1][1] <= cfg.merge_gap_s and end - blocks[-1][0] <= cfg.max_block_s:
+            blocks[-1][1] = end
+            blocks[-1][2].append(text)
+        else:
+            blocks.append([start, end, [text]])
+
+    lines = []
+    last_marker = None
+    for start, _, texts in blocks:
+        marker = _marker(start, cfg.timestamp_step_s)
+        body = " ".join(texts)
+        lines.append(f"{marker} {body}" if marker != last_marker else body)
+        last_marker = marker
+
+    text = "\n".join(lines)
+    return CompactionResult(
+        text=text,
+        original_tokens=estimate_tokens(original),
+        compacted_tokens=estimate_tokens(text),
+        segments_in=len(segments),
+        blocks_out=len(blocks),
+        dropped_segments=dropped,
+    )
@@ -0,0 +1,206 @@
+import json
+import re
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from loguru import logger
+
+# Sentence boundaries for English summaries (and Devanagari danda for cached targets)
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?।])\s+')
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in SENTENCE_SPLIT.split(text or "") if s.strip()]
+
+
+def _key(sentence: str) -> str:
+    """Normalised cache key so spacing/case changes still hit the memory."""
+    norm = " ".join(sentence.lower().split())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+# --- TRANSLATION MEMORY (SENTENCE CACHE) ---
+
+class TranslationMemory:
+    """
+    Persistent sentence-level cache (SQLite) shared by every meeting.
+    Recurring phrasing ("The team reviewed the sprint backlog.") is translated once.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS tm (
+                lang TEXT NOT NULL,
+                key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (lang, key)
+            )
+        """)
+        self._conn.commit()
+
+    def lookup(self, lang: str, sentences: List[str]) -> Dict[str, str]:
+        """Returns {sentence: translation} for every cached sentence."""
+        found = {}
+        with self._lock:
+            for s in sentences:
+                row = self._conn.execute(
+                    "SELECT target FROM tm WHERE lang = ? AND key = ?", (lang, _key(s))
+                ).fetchone()
+                if row:
+                    found[s] = row[0]
+                    self._conn.execute(
+                        "UPDATE tm SET hits = hits + 1 WHERE lang = ? AND key = ?", (lang, _key(s))
+                    )
+            self._conn.commit()
+        return found
+
+    def store(self, lang: str, pairs: Dict[str, str]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tm (lang, key, source, target) VALUES (?, ?, ?, ?)",
+                [(lang, _key(src), src, tgt) for src, tgt in pairs.items() if tgt]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- TRANSLATION STAGE ---
+
+class SummaryTranslator:
+    """
+    Translates the English summary into a target language on a small local model.
+    Runs as its own pipeline stage so it can overlap with MOM/action extraction.
+    """
+
+    def __init__(self, local_llm, memory: TranslationMemory,
+                 cloud_client=None, cloud_model: str = "gemini-1.5-flash-latest", cloud_scheduler=None):
+        self.local_llm = local_llm  # LocalLLMManager for the small model (or None)
+        self.memory = memory
+        self.cloud_client = cloud_client
+        self.cloud_model = cloud_model
+        self.cloud_scheduler = cloud_scheduler  # shared rate limiter for the cloud quota (optional)
+
+    def translate(self, text: str, lang: str, lang_name: str) -> str:
+        sentences = split_sentences(text)
+        if not sentences:
+            return "-"
+
+        cached = self.memory.lookup(lang, sentences)
+        missing = [s for s in sentences if s not in cached]
+        logger.info(f"   [Translate:{lang}] {len(cached)}/{len(sentences)} sentences from memory.")
+
+        if missing:
+            fresh = self._translate_batch(missing, lang_name)
+            if fresh:
+                self.memory.store(lang, fresh)
+                cached.update(fresh)
+
+        if any(s not in cached for s in sentences):
+            return "-"
+        return " ".join(cached[s] for s in sentences)
+
+    def _translate_batch(self, sentences: List[str], lang_name: str) -> Dict[str, str]:
+        prompt = (
+            f"Translate each English sentence into {lang_name} (native script). "
+            f"Keep names, dates and numbers intact.\n"
+            f'Return ONLY JSON: {{"translations": [...]}} with exactly {len(sentences)} strings, same order.\n\n'
+            + json.dumps(sentences, ensure_ascii=False)
+        )
+        for backend in (self._ask_local, self._ask_cloud):
+            try:
+                raw = backend(prompt)
+            except Exception as e:
+                logger.warning(f"   ⚠️ Translation backend failed: {e}")
+                continue
+            if raw is None:
+                continue
+            out = _parse_translations(raw)
+            if len(out) == len(sentences):
+                return dict(zip(sentences, out))
+            logger.warning(f"   ⚠️ Translation returned {len(out)} of {len(sentences)} sentences.")
+        return {}
+
+    def _ask_local(self, prompt: str) -> Optional[str]:
+        if self.local_llm is None:
+            return None
+        response = self.local_llm.chat(format="json", messages=[
+            {'role': 'system', 'content': 'You are a translation API. Output ONLY valid JSON.'},
+            {'role': 'user', 'content': prompt},
+        ])
+        return response['message']['content']
+
+    def _ask_cloud(self, prompt: str) -> Optional[str]:
+        if not self.cloud_client:
+            return None
+        from google.genai import types
+
+        def call():
+            return self.cloud_client.models.generate_content(
+                model=self.cloud_model,
+                contents=prompt,
+                config=types.GenerateContentConfig(response_mime_type="application/json")
+            ).text
+
+        if self.cloud_scheduler:
+            return self.cloud_scheduler.run(call, tokens=len(prompt) // 2)
+        return call()
+
+
+def _parse_translations(raw: str) -> List[str]:
+    start, end = raw.find('{'), raw.rfind('}')
+    if start == -1 or end == -1:
+        return []
+    try:
+        data = json.loads(raw[start:end + 1])
+    except json.JSONDecodeError:
+        return []
+    items = data.get("translations", [])
+    return [str(t).strip() for t in items] if isinstance(items, list) else []
+
+
+# --- STREAM WATCHER ---
+
+class SummaryWatcher:
+    """
+    Watches a streamed JSON response and fires `callback(summary_en)` as soon as
+    the "summary_en" field is complete, while the model is still writing MOM/actions.
+    """
+
+    _PATTERN = re.compile(r'"summary_en"\s*:\s*"((?:[^"\\]|\\.)*)"', re.S)
+
+    def __init__(self, callback: Callable[[str], None]):
+        self.callback = callback
+        self.buffer = []
+        self.fired = False
+
+    def feed(self, chunk: str):
+        if not chunk:
+            return
+        self.buffer.append(chunk)
+        if self.fired:
+            return
+        match = self._PATTERN.search("".join(self.buffer))
+        if match:
+            self.fired = True
+            try:
+                summary = json.loads(f'"{match.group(1)}"')
+            except json.JSONDecodeError:
+                summary = match.group(1)
+            self.callback(summary)
+
+    @property
+    def text(self) -> str:
+        return "".join(self.buffer)
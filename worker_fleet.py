@@ -0,0 +1,547 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import socket
+import sqlite3
+import argparse
+import threading
+import contextlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from loguru import logger
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# SQLite broker: single host only (any number of worker processes on that machine). SQLite's
+# file locking is not reliable on SMB/NFS, so never put this file on a network share.
+BROKER_DB = Path(os.environ.get("RENA_BROKER_DB", Path("meeting_outputs") / "fleet" / "broker.sqlite"))
+# Multi-node: Redis broker (atomic claims over the network) + a shared directory for the
+# recordings/transcripts/reports files, which are each written by one worker only.
+BROKER_URL = os.environ.get("RENA_BROKER_URL")  # e.g. redis://fleet-host:6379/0
+FLEET_STORE = Path(os.environ.get("RENA_FLEET_STORE", BROKER_DB.parent))
+
+HEARTBEAT_S = 10      # workers ping this often while a task runs
+LEASE_TIMEOUT_S = 60  # no ping for this long -> task goes back to the queue
+MAX_ATTEMPTS = 3
+
+TASK_KINDS = ("transcribe", "analyze")
+
+
+# --- BROKER ---
+
+class Broker:
+    """
+    Task queue in a single SQLite file. Every state change is one BEGIN IMMEDIATE
+    transaction, so any number of worker processes/nodes can claim safely.
+    The directory holding the DB doubles as the shared output store.
+    """
+
+    def __init__(self, db_path: Path = BROKER_DB, lease_timeout: float = LEASE_TIMEOUT_S,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.store = self.db_path.parent
+        for sub in ("recordings", "transcripts", "reports"):
+            (self.store / sub).mkdir(parents=True, exist_ok=True)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        with self._txn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    recording TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    worker TEXT,
+                    heartbeat REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT NOT NULL DEFAULT '{}',
+                    result TEXT,
+                    error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_queue ON tasks (status, kind, id)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS workers (
+                    id TEXT PRIMARY KEY, host TEXT, kinds TEXT, heartbeat REAL, task_id INTEGER
+                )
+            """)
+
+    def _txn(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return _Txn(conn)
+
+    # Coordinator side
+
+    def register_recording(self, audio_path: str, copy: bool = True) -> int:
+        """Queues a recording for transcription. Copies it into the shared store unless already there."""
+        src = Path(audio_path).resolve()
+        if copy and self.store.resolve() not in src.parents:
+            dst = self.store / "recordings" / f"{uuid.uuid4().hex[:8]}_{src.name}"
+            shutil.copy2(src, dst)
+            src = dst
+        rel = os.path.relpath(src, self.store)
+        with self._txn() as conn:
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE recording = ? AND status IN ('queued', 'running')", (rel,)
+            ).fetchone()
+            if row:
+                return row["id"]
+        return self.enqueue("transcribe", rel)
+
+    def enqueue(self, kind: str, recording: str, payload: Optional[Dict] = None) -> int:
+        now = time.time()
+        with self._txn() as conn:
+            cur = conn.execute(
+                "INSERT INTO tasks (recording, kind, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (recording, kind, json.dumps(payload or {}), now, now)
+            )
+            return cur.lastrowid
+
+    def requeue_stale(self) -> int:
+        """Tasks whose worker stopped heart-beating are handed to someone else."""
+        cutoff = time.time() - self.lease_timeout
+        with self._txn() as conn:
+            return self._requeue_stale(conn, cutoff)
+
+    def _requeue_stale(self, conn, cutoff: float) -> int:
+        stale = conn.execute(
+            "SELECT id, worker, attempts FROM tasks WHERE status = 'running' AND heartbeat < ?", (cutoff,)
+        ).fetchall()
+        for row in stale:
+            status = "queued" if row["attempts"] < self.max_attempts else "failed"
+            conn.execute(
+                "UPDATE tasks SET status = ?, worker = NULL, error = ?, updated = ? WHERE id = ?",
+                (status, f"worker {row['worker']} lost", time.time(), row["id"])
+            )
+            logger.warning(f"   [Fleet] Task {row['id']} from dead worker {row['worker']} -> {status}.")
+        return len(stale)
+
+    # Worker side
+
+    def claim(self, worker_id: str, kinds: Iterable[str]) -> Optional[Dict]:
+        kinds = list(kinds)
+        now = time.time()
+        with self._txn() as conn:
+            self._requeue_stale(conn, now - self.lease_timeout)
+            row = conn.execute(
+                f"SELECT * FROM tasks WHERE status = 'queued' AND kind IN ({','.join('?' * len(kinds))}) "
+                f"ORDER BY id LIMIT 1", kinds
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'running', worker = ?, heartbeat = ?, attempts = attempts + 1, "
+                "updated = ? WHERE id = ?", (worker_id, now, now, row["id"])
+            )
+            task = dict(row)
+            task["payload"] = json.loads(task["payload"] or "{}")
+            return task
+
+    def heartbeat(self, worker_id: str, task_id: Optional[int], kinds: Iterable[str] = ()) -> bool:
+        """Returns False if the task was taken away from this worker."""
+        now = time.time()
+        with self._txn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (id, host, kinds, heartbeat, task_id) VALUES (?, ?, ?, ?, ?)",
+                (worker_id, socket.gethostname(), ",".join(kinds), now, task_id)
+            )
+            if task_id is None:
+                return True
+            cur = conn.execute(
+                "UPDATE tasks SET heartbeat = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (now, task_id, worker_id)
+            )
+            return cur.rowcount == 1
+
+    def complete(self, worker_id: str, task_id: int, result: str, follow_up: Optional[Dict] = None) -> bool:
+        now = time.time()
+        with self._txn() as conn:
+            cur = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, updated = ? "
+                "WHERE id = ? AND worker = ? AND status = 'running'", (result, now, task_id, worker_id)
+            )
+            if cur.rowcount != 1:
+                return False  # lease expired and someone else owns it now
+            if follow_up:
+                conn.execute(
+                    "INSERT INTO tasks (recording, kind, payload, created, updated) VALUES (?, ?, ?, ?, ?)",
+                    (follow_up["recording"], follow_up["kind"], json.dumps(follow_up.get("payload", {})), now, now)
+                )
+            return True
+
+    def fail(self, worker_id: str, task_id: int, error: str):
+        with self._txn() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, "
+                "worker = NULL, error = ?, updated = ? WHERE id = ? AND worker = ?",
+                (self.max_attempts, error[:2000], time.time(), task_id, worker_id)
+            )
+
+    def status(self) -> Dict:
+        cutoff = time.time() - self.lease_timeout
+        with self._txn() as conn:
+            counts = {f"{r['kind']}:{r['status']}": r["n"] for r in conn.execute(
+                "SELECT kind, status, COUNT(*) AS n FROM tasks GROUP BY kind, status")}
+            workers = [dict(r) for r in conn.execute(
+                "SELECT id, host, kinds, task_id FROM workers WHERE heartbeat >= ?", (cutoff,))]
+        return {"tasks": counts, "live_workers": workers}
+
+    def lock(self, name: str):
+        """Cross-worker mutex for shared files in the store; one host, so SQLite's own locking suffices."""
+        return contextlib.nullcontext()
+
+
+class _Txn:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        self.conn.close()
+
+
+# --- REDIS BROKER (multi-node) ---
+
+# Every state change is one Lua script, so it is atomic on the Redis server.
+# Keys (prefix P): P:next_id, P:task:<id> (hash), P:queue:<kind> (list of ids),
+# P:running (zset id -> last heartbeat), P:active (recording -> open task id), P:workers (hash).
+
+_ENQUEUE = """
+local p = ARGV[1]
+if ARGV[6] == '1' then
+  local open = redis.call('HGET', p .. ':active', ARGV[3])
+  if open then return tonumber(open) end
+end
+local id = redis.call('INCR', p .. ':next_id')
+redis.call('HSET', p .. ':task:' .. id, 'id', id, 'kind', ARGV[2], 'recording', ARGV[3], 'payload', ARGV[4],
+           'status', 'queued', 'attempts', 0, 'created', ARGV[5], 'updated', ARGV[5])
+redis.call('RPUSH', p .. ':queue:' .. ARGV[2], id)
+redis.call('HSET', p .. ':active', ARGV[3], id)
+return id
+"""
+
+_REQUEUE_STALE = """
+local p, cutoff, max_attempts, now = ARGV[1], ARGV[2], tonumber(ARGV[3]), ARGV[4]
+local out = {}
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', p .. ':running', '-inf', '(' .. cutoff)) do
+  local k = p .. ':task:' .. id
+  local worker = redis.call('HGET', k, 'worker') or ''
+  local status = 'failed'
+  if tonumber(redis.call('HGET', k, 'attempts')) < max_attempts then status = 'queued' end
+  redis.call('ZREM', p .. ':running', id)
+  redis.call('HSET', k, 'status', status, 'worker', '', 'error', 'worker ' .. worker .. ' lost', 'updated', now)
+  if status == 'queued' then
+    redis.call('LPUSH', p .. ':queue:' .. redis.call('HGET', k, 'kind'), id)
+  else
+    redis.call('HDEL', p .. ':active', redis.call('HGET', k, 'recording'))
+  end
+  table.insert(out, id .. ' ' .. worker .. ' ' .. status)
+end
+return out
+"""
+
+_CLAIM = """
+local p, worker, now = ARGV[1], ARGV[2], ARGV[3]
+local best, best_queue
+for i = 4, #ARGV do
+  local queue = p .. ':queue:' .. ARGV[i]
+  local head = redis.call('LINDEX', queue, 0)
+  if head and (not best or tonumber(head) < tonumber(best)) then best, best_queue = head, queue end
+end
+if not best then return nil end
+redis.call('LPOP', best_queue)
+local k = p .. ':task:' .. best
+redis.call('HSET', k, 'status', 'running', 'worker', worker, 'heartbeat', now, 'updated', now)
+redis.call('HINCRBY', k, 'attempts', 1)
+redis.call('ZADD', p .. ':running', now, best)
+return redis.call('HGETALL', k)
+"""
+
+_HEARTBEAT = """
+local p, worker, id, now = ARGV[1], ARGV[2], ARGV[3], ARGV[4]
+local k = p .. ':task:' .. id
+if redis.call('HGET', k, 'worker') ~= worker or redis.call('HGET', k, 'status') ~= 'running' then return 0 end
+redis.call('HSET', k, 'heartbeat', now)
+redis.call('ZADD', p .. ':running', now, id)
+return 1
+"""
+
+_COMPLETE = """
+local p, worker, id, now, result = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5]
+local k = p .. ':task:' .. id
+if redis.call('HGET', k, 'worker') ~= worker or redis.call('HGET', k, 'status') ~= 'running' then return 0 end
+redis.call('HSET', k, 'status', 'done', 'result', result, 'updated', now)
+redis.call('ZREM', p .. ':running', id)
+local recording = redis.call('HGET', k, 'recording')
+redis.call('HDEL', p .. ':active', recording)
+if ARGV[6] ~= '' then
+  local next_id = redis.call('INCR', p .. ':next_id')
+  redis.call('HSET', p .. ':task:' .. next_id, 'id', next_id, 'kind', ARGV[6], 'recording', ARGV[7],
+             'payload', ARGV[8], 'status', 'queued', 'attempts', 0, 'created', now, 'updated', now)
+  redis.call('RPUSH', p .. ':queue:' .. ARGV[6], next_id)
+  redis.call('HSET', p .. ':active', ARGV[7], next_id)
+end
+return 1
+"""
+
+_FAIL = """
+local p, worker, id, now, err, max_attempts = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], tonumber(ARGV[6])
+local k = p .. ':task:' .. id
+if redis.call('HGET', k, 'worker') ~= worker then return 0 end
+local status = 'failed'
+if tonumber(redis.call('HGET', k, 'attempts')) < max_attempts then status = 'queued' end
+redis.call('HSET', k, 'status', status, 'worker', '', 'error', err, 'updated', now)
+redis.call('ZREM', p .. ':running', id)
+if status == 'queued' then
+  redis.call('LPUSH', p .. ':queue:' .. redis.call('HGET', k, 'kind'), id)
+else
+  redis.call('HDEL', p .. ':active', redis.call('HGET', k, 'recording'))
+end
+return 1
+"""
+
+
+class RedisBroker:
+    """
+    Same interface as Broker, for fleets spanning several machines: claims, leases and
+    heartbeats are atomic Lua scripts on one Redis server. Files still live in `store`
+    (a share every node can reach); each file there has exactly one writer.
+    """
+
+    def __init__(self, url: str, store: Path = FLEET_STORE, prefix: str = "rena:fleet",
+                 lease_timeout: float = LEASE_TIMEOUT_S, max_attempts: int = MAX_ATTEMPTS):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("RENA_BROKER_URL is set but the 'redis' package is not installed (pip install redis).")
+        self.redis = redis.Redis.from_url(url, decode_responses=True)
+        self.store = Path(store)
+        for sub in ("recordings", "transcripts", "reports"):
+            (self.store / sub).mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self._enqueue = self.redis.register_script(_ENQUEUE)
+        self._requeue = self.redis.register_script(_REQUEUE_STALE)
+        self._claim = self.redis.register_script(_CLAIM)
+        self._heartbeat = self.redis.register_script(_HEARTBEAT)
+        self._complete = self.redis.register_script(_COMPLETE)
+        self._fail = self.redis.register_script(_FAIL)
+
+    # Coordinator side
+
+    def register_recording(self, audio_path: str, copy: bool = True) -> int:
+        src = Path(audio_path).resolve()
+        if copy and self.store.resolve() not in src.parents:
+            dst = self.store / "recordings" / f"{uuid.uuid4().hex[:8]}_{src.name}"
+            shutil.copy2(src, dst)
+            src = dst
+        rel = Path(os.path.relpath(src, self.store)).as_posix()
+        return int(self._enqueue(args=[self.prefix, "transcribe", rel, "{}", time.time(), 1]))
+
+    def enqueue(self, kind: str, recording: str, payload: Optional[Dict] = None) -> int:
+        return int(self._enqueue(args=[self.prefix, kind, recording, json.dumps(payload or {}), time.time(), 0]))
+
+    def requeue_stale(self) -> int:
+        stale = self._requeue(args=[self.prefix, time.time() - self.lease_timeout, self.max_attempts, time.time()])
+        for line in stale:
+            task_id, worker, status = line.split(" ")
+            logger.warning(f"   [Fleet] Task {task_id} from dead worker {worker} -> {status}.")
+        return len(stale)
+
+    # Worker side
+
+    def claim(self, worker_id: str, kinds: Iterable[str]) -> Optional[Dict]:
+        self.requeue_stale()
+        flat = self._claim(args=[self.prefix, worker_id, time.time(), *kinds])
+        if not flat:
+            return None
+        task = dict(zip(flat[::2], flat[1::2]))
+        task["id"] = int(task["id"])
+        task["attempts"] = int(task["attempts"])
+        task["heartbeat"] = float(task["heartbeat"])
+        task["payload"] = json.loads(task.get("payload") or "{}")
+        return task
+
+    def heartbeat(self, worker_id: str, task_id: Optional[int], kinds: Iterable[str] = ()) -> bool:
+        now = time.time()
+        self.redis.hset(f"{self.prefix}:workers", worker_id, json.dumps({
+            "id": worker_id, "host": socket.gethostname(), "kinds": ",".join(kinds),
+            "heartbeat": now, "task_id": task_id
+        }))
+        if task_id is None:
+            return True
+        return self._heartbeat(args=[self.prefix, worker_id, task_id, now]) == 1
+
+    def complete(self, worker_id: str, task_id: int, result: str, follow_up: Optional[Dict] = None) -> bool:
+        follow_up = follow_up or {}
+        return self._complete(args=[
+            self.prefix, worker_id, task_id, time.time(), result,
+            follow_up.get("kind", ""), follow_up.get("recording", ""), json.dumps(follow_up.get("payload", {}))
+        ]) == 1
+
+    def fail(self, worker_id: str, task_id: int, error: str):
+        self._fail(args=[self.prefix, worker_id, task_id, time.time(), error[:2000], self.max_attempts])
+
+    def status(self) -> Dict:
+        cutoff = time.time() - self.lease_timeout
+        counts: Dict[str, int] = {}
+        for key in self.redis.scan_iter(f"{self.prefix}:task:*", count=500):
+            kind, status = self.redis.hmget(key, "kind", "status")
+            counts[f"{kind}:{status}"] = counts.get(f"{kind}:{status}", 0) + 1
+        workers = []
+        for raw in self.redis.hvals(f"{self.prefix}:workers"):
+            w = json.loads(raw)
+            if w["heartbeat"] >= cutoff:
+                workers.append({k: w[k] for k in ("id", "host", "kinds", "task_id")})
+        return {"tasks": counts, "live_workers": workers}
+
+    def lock(self, name: str):
+        """Cross-node mutex (e.g. around the shared action_items.sqlite, whose locks don't work over SMB/NFS)."""
+        return self.redis.lock(f"{self.prefix}:lock:{name}", timeout=120, blocking_timeout=300)
+
+
+def make_broker(db_path: Optional[Path] = None, url: Optional[str] = None):
+    """RedisBroker when a URL is configured (RENA_BROKER_URL), else the single-host SQLite Broker."""
+    url = url or BROKER_URL
+    if url:
+        return RedisBroker(url)
+    return Broker(Path(db_path or BROKER_DB))
+
+
+# --- WORKER ---
+
+class FleetWorker:
+    """Stateless worker: pulls transcribe/analyze tasks, writes results into the shared store."""
+
+    def __init__(self, broker: Broker, kinds: Iterable[str] = TASK_KINDS, whisper_model: str = "medium"):
+        self.broker = broker
+        self.kinds = [k for k in kinds if k in TASK_KINDS]
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:4]}"
+        self.whisper_model = whisper_model
+        self._generator = None
+
+    @property
+    def generator(self):
+        if self._generator is None:
+            from meeting_notes_generator import AdaptiveMeetingNotesGenerator
+            from action_tracker import ActionTracker
+            # Analyze-only workers never load Whisper; transcribe-only workers never load/pin the LLMs
+            whisper = self.whisper_model if "transcribe" in self.kinds else None
+            analyze = "analyze" in self.kinds
+            # One action history for the whole fleet, next to the broker (no WAL on network shares)
+            tracker = ActionTracker(self.broker.store / "action_items.sqlite", wal=False) if analyze else None
+            self._generator = AdaptiveMeetingNotesGenerator(whisper_model=whisper, action_tracker=tracker,
+                                                            llm=analyze)
+        return self._generator
+
+    def run_forever(self, poll_s: float = 2.0):
+        logger.info(f"👷 Worker {self.worker_id} online ({', '.join(self.kinds)}) -> {self.broker.store}")
+        while True:
+            task = self.broker.claim(self.worker_id, self.kinds)
+            if not task:
+                self.broker.heartbeat(self.worker_id, None, self.kinds)
+                time.sleep(poll_s)
+                continue
+            self.run_task(task)
+
+    def run_task(self, task: Dict):
+        logger.info(f"   [Fleet] Task {task['id']} ({task['kind']}) <- {task['recording']}")
+        stop = threading.Event()
+        pinger = threading.Thread(target=self._heartbeat_loop, args=(task["id"], stop), daemon=True)
+        pinger.start()
+        try:
+            result, follow_up = getattr(self, f"_{task['kind']}")(task)
+            if not self.broker.complete(self.worker_id, task["id"], result, follow_up):
+                logger.warning(f"   ⚠️ Task {task['id']} was reassigned while running; result discarded.")
+        except Exception as e:
+            logger.error(f"   ❌ Task {task['id']} failed: {e}")
+            self.broker.fail(self.worker_id, task["id"], repr(e))
+        finally:
+            stop.set()
+            pinger.join()
+
+    def _heartbeat_loop(self, task_id: int, stop: threading.Event):
+        while not stop.wait(HEARTBEAT_S):
+            try:
+                if not self.broker.heartbeat(self.worker_id, task_id, self.kinds):
+                    return
+            except sqlite3.Error as e:
+                logger.warning(f"   ⚠️ Heartbeat failed: {e}")
+
+    def _transcribe(self, task: Dict):
+        audio = self.broker.store / task["recording"]
+        res = self.generator.transcribe(str(audio))
+        out = self.broker.store / "transcripts" / f"{audio.stem}.json"
+        out.write_text(json.dumps(res, ensure_ascii=False), encoding="utf-8")
+        rel = os.path.relpath(out, self.broker.store)
+        return rel, {"kind": "analyze", "recording": task["recording"], "payload": {"transcript": rel}}
+
+    def _analyze(self, task: Dict):
+        audio = self.broker.store / task["recording"]
+        res = json.loads((self.broker.store / task["payload"]["transcript"]).read_text(encoding="utf-8"))
+        gen = self.generator
+        intel = gen.analyze_transcript(gen.compact(res["segments"]))
+        # The tracker DB lives on the shared store: one writer at a time across the fleet
+        with self.broker.lock("action_tracker"):
+            gen.track_actions(intel, f"{audio.stem}_report")
+        pdf = gen.generate_pdf(intel, res["segments"], f"{audio.stem}_report",
+                               output_dir=self.broker.store / "reports")
+        if not pdf:
+            raise RuntimeError("PDF generation failed")
+        return os.path.relpath(pdf, self.broker.store), None
+
+
+# --- ENTRY POINT ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RENA multi-node transcription/analysis fleet")
+    parser.add_argument("--broker", default=str(BROKER_DB), help="Path of the SQLite broker DB (single host)")
+    parser.add_argument("--broker-url", default=BROKER_URL, help="Redis URL for a multi-node fleet")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    reg = sub.add_parser("register", help="Queue a recording")
+    reg.add_argument("audio")
+
+    wrk = sub.add_parser("worker", help="Run a worker on this node")
+    wrk.add_argument("--kinds", default=",".join(TASK_KINDS))
+    wrk.add_argument("--whisper", default="medium")
+
+    sub.add_parser("coordinator", help="Reap dead workers and print fleet status")
+    sub.add_parser("status", help="Print fleet status once")
+
+    args = parser.parse_args(argv)
+    broker = make_broker(Path(args.broker), args.broker_url)
+
+    if args.cmd == "register":
+        print(f"📥 Queued task {broker.register_recording(args.audio)} for {args.audio}")
+    elif args.cmd == "worker":
+        FleetWorker(broker, args.kinds.split(","), args.whisper).run_forever()
+    elif args.cmd == "status":
+        print(json.dumps(broker.status(), indent=2))
+    elif args.cmd == "coordinator":
+        while True:
+            broker.requeue_stale()
+            logger.info(f"   [Fleet] {broker.status()}")
+            time.sleep(LEASE_TIMEOUT_S / 2)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
+        sys.exit(0)